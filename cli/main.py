@@ -24,6 +24,7 @@ from rich import box
 from rich.align import Align
 from rich.rule import Rule
 
+from tradingagents.agents.utils.debate_utils import debate_transcript, latest_argument
 from tradingagents.graph.trading_graph import TradingAgentsGraph
 from tradingagents.default_config import DEFAULT_CONFIG
 from cli.models import AnalystType
@@ -587,10 +588,11 @@ def display_complete_report(final_state):
         debate_state = final_state["investment_debate_state"]
 
         # Bull Researcher Analysis
-        if debate_state.get("bull_history"):
+        bull_transcript = debate_transcript(debate_state, "Bull")
+        if bull_transcript:
             research_reports.append(
                 Panel(
-                    Markdown(debate_state["bull_history"]),
+                    Markdown(bull_transcript),
                     title="Bull Researcher",
                     border_style="blue",
                     padding=(1, 2),
@@ -598,10 +600,11 @@ def display_complete_report(final_state):
             )
 
         # Bear Researcher Analysis
-        if debate_state.get("bear_history"):
+        bear_transcript = debate_transcript(debate_state, "Bear")
+        if bear_transcript:
             research_reports.append(
                 Panel(
-                    Markdown(debate_state["bear_history"]),
+                    Markdown(bear_transcript),
                     title="Bear Researcher",
                     border_style="blue",
                     padding=(1, 2),
@@ -651,10 +654,11 @@ def display_complete_report(final_state):
         risk_state = final_state["risk_debate_state"]
 
         # Aggressive (Risky) Analyst Analysis
-        if risk_state.get("risky_history"):
+        risky_transcript = debate_transcript(risk_state, "Risky")
+        if risky_transcript:
             risk_reports.append(
                 Panel(
-                    Markdown(risk_state["risky_history"]),
+                    Markdown(risky_transcript),
                     title="Aggressive Analyst",
                     border_style="blue",
                     padding=(1, 2),
@@ -662,10 +666,11 @@ def display_complete_report(final_state):
             )
 
         # Conservative (Safe) Analyst Analysis
-        if risk_state.get("safe_history"):
+        safe_transcript = debate_transcript(risk_state, "Safe")
+        if safe_transcript:
             risk_reports.append(
                 Panel(
-                    Markdown(risk_state["safe_history"]),
+                    Markdown(safe_transcript),
                     title="Conservative Analyst",
                     border_style="blue",
                     padding=(1, 2),
@@ -673,10 +678,11 @@ def display_complete_report(final_state):
             )
 
         # Neutral Analyst Analysis
-        if risk_state.get("neutral_history"):
+        neutral_transcript = debate_transcript(risk_state, "Neutral")
+        if neutral_transcript:
             risk_reports.append(
                 Panel(
-                    Markdown(risk_state["neutral_history"]),
+                    Markdown(neutral_transcript),
                     title="Neutral Analyst",
                     border_style="blue",
                     padding=(1, 2),
@@ -927,34 +933,28 @@ def run_analysis():
                     debate_state = chunk["investment_debate_state"]
 
                     # Update Bull Researcher status and report
-                    if "bull_history" in debate_state and debate_state["bull_history"]:
+                    latest_bull = latest_argument(debate_state, "Bull")
+                    if latest_bull:
                         # Keep all research team members in progress
                         update_research_team_status("in_progress")
-                        # Extract latest bull response
-                        bull_responses = debate_state["bull_history"].split("\n")
-                        latest_bull = bull_responses[-1] if bull_responses else ""
-                        if latest_bull:
-                            message_buffer.add_message("Reasoning", latest_bull)
-                            # Update research report with bull's latest analysis
-                            message_buffer.update_report_section(
-                                "investment_plan",
-                                f"### Bull Researcher Analysis\n{latest_bull}",
-                            )
+                        message_buffer.add_message("Reasoning", latest_bull)
+                        # Update research report with bull's latest analysis
+                        message_buffer.update_report_section(
+                            "investment_plan",
+                            f"### Bull Researcher Analysis\n{latest_bull}",
+                        )
 
                     # Update Bear Researcher status and report
-                    if "bear_history" in debate_state and debate_state["bear_history"]:
+                    latest_bear = latest_argument(debate_state, "Bear")
+                    if latest_bear:
                         # Keep all research team members in progress
                         update_research_team_status("in_progress")
-                        # Extract latest bear response
-                        bear_responses = debate_state["bear_history"].split("\n")
-                        latest_bear = bear_responses[-1] if bear_responses else ""
-                        if latest_bear:
-                            message_buffer.add_message("Reasoning", latest_bear)
-                            # Update research report with bear's latest analysis
-                            message_buffer.update_report_section(
-                                "investment_plan",
-                                f"{message_buffer.report_sections['investment_plan']}\n\n### Bear Researcher Analysis\n{latest_bear}",
-                            )
+                        message_buffer.add_message("Reasoning", latest_bear)
+                        # Update research report with bear's latest analysis
+                        message_buffer.update_report_section(
+                            "investment_plan",
+                            f"{message_buffer.report_sections['investment_plan']}\n\n### Bear Researcher Analysis\n{latest_bear}",
+                        )
 
                     # Update Research Manager status and final decision
                     if (
@@ -0,0 +1,35 @@
+import pytest
+
+from tradingagents.dataflows import config as dataflows_config
+
+
+class FakeClock:
+    """Stands in for the time module: sleep() advances the clock instead of blocking."""
+
+    def __init__(self, start: float = 1000.0):
+        self.now = start
+
+    def time(self) -> float:
+        return self.now
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def perf_counter(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture(autouse=True)
+def restore_config():
+    """Undo set_config calls made by a test."""
+    saved = dict(dataflows_config.get_config())
+    yield
+    dataflows_config._config = saved
@@ -0,0 +1,60 @@
+import pandas as pd
+import pytest
+
+from tradingagents.dataflows import ohlcv_cache
+from tradingagents.dataflows.config import set_config
+from tradingagents.dataflows.ohlcv_cache import (
+    clear_prefetched_ohlcv,
+    get_prefetched_ohlcv,
+    prefetch_ohlcv,
+)
+
+TODAY = "2024-05-10"
+
+
+def _fake_download(symbols, start, end, **kwargs):
+    dates = pd.date_range("2024-04-01", "2024-05-10", freq="B")
+    columns = pd.MultiIndex.from_product(
+        [symbols, ["Open", "High", "Low", "Close", "Volume"]]
+    )
+    return pd.DataFrame(1.0, index=pd.Index(dates, name="Date"), columns=columns)
+
+
+@pytest.fixture(autouse=True)
+def prefetched(tmp_path, clock, monkeypatch):
+    monkeypatch.setattr(ohlcv_cache, "time", clock)
+    monkeypatch.setattr(ohlcv_cache.yf, "download", _fake_download)
+    set_config(
+        {
+            "data_cache_dir": str(tmp_path),
+            "tool_cache": {"ttl": {"core_stock_apis": 3600}, "settled_after_days": 2},
+        }
+    )
+    clear_prefetched_ohlcv()
+    assert prefetch_ohlcv(["nvda"], today=TODAY) == ["NVDA"]
+    yield
+    clear_prefetched_ohlcv()
+
+
+def test_fresh_entry_serves_recent_bars():
+    bars = get_prefetched_ohlcv("nvda", "2024-05-01", TODAY)
+    assert bars is not None
+    assert bars.index.max() < pd.Timestamp(TODAY)
+
+
+def test_range_outside_the_prefetch_is_not_served():
+    assert get_prefetched_ohlcv("NVDA", "2024-05-01", "2024-05-11") is None
+
+
+def test_stale_entry_stops_serving_recent_bars(clock):
+    clock.sleep(3601)
+    assert get_prefetched_ohlcv("NVDA", "2024-05-01", TODAY) is None
+    # The entry is dropped, so even settled ranges now go back to the series
+    assert get_prefetched_ohlcv("NVDA", "2024-04-01", "2024-04-30") is None
+
+
+def test_stale_entry_keeps_serving_settled_history(clock):
+    clock.sleep(3601)
+    bars = get_prefetched_ohlcv("NVDA", "2024-04-01", "2024-05-08")
+    assert bars is not None
+    assert bars.index.max() == pd.Timestamp("2024-05-07")
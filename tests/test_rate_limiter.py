@@ -0,0 +1,66 @@
+import pytest
+
+from tradingagents.dataflows import rate_limiter
+from tradingagents.dataflows.rate_limiter import TokenBucketLimiter
+
+
+@pytest.fixture(autouse=True)
+def fake_time(clock, monkeypatch):
+    monkeypatch.setattr(rate_limiter, "time", clock)
+
+
+def test_full_bucket_does_not_wait():
+    limiter = TokenBucketLimiter([(3, 60)])
+    assert [limiter.acquire() for _ in range(3)] == [0, 0, 0]
+
+
+def test_empty_bucket_waits_for_refill(clock):
+    limiter = TokenBucketLimiter([(2, 10)])
+    limiter.acquire()
+    limiter.acquire()
+
+    started = clock.now
+    assert limiter.acquire() == pytest.approx(5.0)
+    assert clock.now - started == pytest.approx(5.0)
+    # The next caller queues behind the reservation
+    assert limiter.acquire() == pytest.approx(5.0)
+
+
+def test_every_bucket_must_have_a_token(clock):
+    limiter = TokenBucketLimiter([(5, 60), (2, 86400)])
+    limiter.acquire()
+    limiter.acquire()
+    assert limiter.acquire() == pytest.approx(43200.0)
+
+
+def test_wait_over_max_wait_is_rejected_without_taking_a_token(clock):
+    limiter = TokenBucketLimiter([(1, 60)])
+    limiter.acquire()
+
+    started = clock.now
+    assert limiter.acquire(max_wait=10) is None
+    assert clock.now == started  # did not sleep
+    assert limiter.acquire(max_wait=60) == pytest.approx(60.0)
+
+
+def test_drain_empties_only_the_shortest_bucket(clock):
+    limiter = TokenBucketLimiter([(5, 60), (25, 86400)])
+    limiter.acquire()
+    limiter.drain()
+
+    assert limiter.acquire() == pytest.approx(12.0)  # one token of the minute bucket
+    clock.sleep(60)
+    # The daily bucket was not drained, so a refilled minute bucket serves 5 at once
+    assert [limiter.acquire() for _ in range(5)] == [0, 0, 0, 0, 0]
+
+
+@pytest.mark.skipif(rate_limiter.fcntl is None, reason="needs fcntl")
+def test_state_file_shares_tokens_between_limiters(tmp_path):
+    state_path = str(tmp_path / "av_bucket.json")
+    first = TokenBucketLimiter([(2, 60)], state_path)
+    second = TokenBucketLimiter([(2, 60)], state_path)
+
+    first.acquire()
+    second.acquire()
+    assert first.acquire(max_wait=0) is None
+    assert second.acquire() == pytest.approx(30.0)
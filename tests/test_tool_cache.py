@@ -0,0 +1,122 @@
+from datetime import date, timedelta
+
+import pytest
+
+from tradingagents.dataflows import tool_cache
+from tradingagents.dataflows.config import set_config
+from tradingagents.dataflows.tool_cache import (
+    clear_tool_cache,
+    get_cached_result,
+    get_tool_cache_stats,
+    put_cached_result,
+)
+
+TODAY = date.today().isoformat()
+YESTERDAY = (date.today() - timedelta(days=1)).isoformat()
+LAST_YEAR = (date.today() - timedelta(days=365)).isoformat()
+
+
+@pytest.fixture(autouse=True)
+def cache(tmp_path, clock, monkeypatch):
+    monkeypatch.setattr(tool_cache, "time", clock)
+    set_config(
+        {
+            "tool_cache": {
+                "enabled": True,
+                "path": str(tmp_path / "tool_cache.sqlite"),
+                "ttl": {"news_data": 3600},
+            }
+        }
+    )
+    clear_tool_cache()
+
+
+def _put(key, result, *dates):
+    return put_cached_result(
+        key, "get_news", "news_data", "local", ("NVDA", *dates), {}, result
+    )
+
+
+def test_current_result_expires_after_ttl(clock):
+    assert _put("k", "## News\nNVDA beats estimates", LAST_YEAR, TODAY)
+    clock.sleep(3599)
+    assert get_cached_result("k") == "## News\nNVDA beats estimates"
+    clock.sleep(2)
+    assert get_cached_result("k") is None
+    assert get_tool_cache_stats()["expired"] == 1
+
+
+def test_settled_history_is_pinned(clock):
+    assert _put("k", "## News\nold headline", LAST_YEAR, LAST_YEAR)
+    clock.sleep(10 * 365 * 86400)
+    assert get_cached_result("k") == "## News\nold headline"
+
+
+def test_recent_history_gets_a_ttl(clock):
+    # Vendors still revise the last day or two, so this is not history yet
+    assert _put("k", "## News\nyesterday's headline", LAST_YEAR, YESTERDAY)
+    clock.sleep(3601)
+    assert get_cached_result("k") is None
+
+
+@pytest.mark.parametrize(
+    "result",
+    [
+        "",
+        "  \n",
+        "## NVDA News, from 2024-01-01 to 2024-01-08:\n\n",
+        "Error fetching news: timeout",
+        "No data found for symbol 'NVDA' between 2024-01-01 and 2024-01-08",
+        "No insider transactions data found for symbol 'NVDA'",
+        None,
+    ],
+)
+def test_errors_and_empty_results_are_not_stored(result):
+    assert not _put("k", result, LAST_YEAR)
+    assert get_cached_result("k") is None
+
+
+def test_least_recently_used_entries_are_evicted(clock):
+    set_config(
+        {
+            "tool_cache": {
+                **tool_cache._settings(),
+                "max_size_mb": 3000 / (1024 * 1024),
+            }
+        }
+    )
+    for key in ("a", "b", "c"):
+        assert _put(key, "x" * 1000, LAST_YEAR)
+        clock.sleep(1)
+    assert get_cached_result("a") is not None  # now more recent than b
+    clock.sleep(1)
+
+    assert _put("d", "x" * 1000, LAST_YEAR)
+    assert get_cached_result("b") is None
+    for key in ("a", "c", "d"):
+        assert get_cached_result(key) is not None
+    stats = get_tool_cache_stats()
+    assert stats["evictions"] == 1
+    assert stats["size_bytes"] == 3000
+
+
+def _stored_access_time(key):
+    settings = tool_cache._settings()
+    return tool_cache._connect(settings).execute(
+        "SELECT last_access FROM results WHERE key = ?", (key,)
+    ).fetchone()[0]
+
+
+def test_hits_batch_their_access_time_updates(clock, monkeypatch):
+    monkeypatch.setattr(tool_cache, "SIZE_CHECK_INTERVAL", 3)
+    for key in ("a", "b", "c"):
+        assert _put(key, "## News\nheadline", LAST_YEAR)
+    stored = _stored_access_time("a")
+
+    clock.sleep(10)
+    assert get_cached_result("a") is not None
+    assert get_cached_result("b") is not None
+    assert _stored_access_time("a") == stored  # hits did not write
+
+    assert get_cached_result("c") is not None  # third pending hit flushes
+    assert _stored_access_time("a") == stored + 10
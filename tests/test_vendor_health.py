@@ -0,0 +1,138 @@
+import threading
+import time
+
+import pytest
+
+from tradingagents.dataflows import interface, vendor_health
+from tradingagents.dataflows.config import set_config
+from tradingagents.dataflows.vendor_health import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    get_vendor_health,
+    is_vendor_available,
+    record_vendor_call,
+    reset_vendor_health,
+)
+
+
+@pytest.fixture(autouse=True)
+def breaker(clock, monkeypatch):
+    monkeypatch.setattr(vendor_health, "time", clock)
+    set_config(
+        {
+            "vendor_circuit_breaker": {
+                "window": 10,
+                "min_calls": 4,
+                "failure_threshold": 0.5,
+                "open_seconds": 30,
+            }
+        }
+    )
+    reset_vendor_health()
+    yield
+    reset_vendor_health()
+
+
+def _state(vendor="yfinance", impl="get_data"):
+    return get_vendor_health()[vendor][impl]
+
+
+def _fail(times, vendor="yfinance", impl="get_data"):
+    for _ in range(times):
+        record_vendor_call(vendor, impl, False, 0.1, error=RuntimeError("down"))
+
+
+def test_stays_closed_below_min_calls():
+    _fail(3)
+    assert _state()["state"] == CLOSED
+    assert is_vendor_available("yfinance", "get_data")
+
+
+def test_failure_rate_opens_circuit():
+    record_vendor_call("yfinance", "get_data", True, 0.1)
+    _fail(3)
+    assert _state()["state"] == OPEN
+    assert _state()["last_error"] == "RuntimeError: down"
+    assert not is_vendor_available("yfinance", "get_data")
+
+
+def test_rate_limit_opens_at_once():
+    record_vendor_call("alpha_vantage", "get_stock", False, 0.1, rate_limited=True)
+    assert _state("alpha_vantage", "get_stock")["state"] == OPEN
+    assert _state("alpha_vantage", "get_stock")["rate_limited"] == 1
+
+
+def test_half_open_probe_success_closes(clock):
+    _fail(4)
+    clock.sleep(31)
+
+    assert is_vendor_available("yfinance", "get_data")  # the probe
+    assert _state()["state"] == HALF_OPEN
+    assert not is_vendor_available("yfinance", "get_data")  # one probe at a time
+
+    record_vendor_call("yfinance", "get_data", True, 0.1)
+    assert _state()["state"] == CLOSED
+    assert is_vendor_available("yfinance", "get_data")
+
+
+def test_half_open_probe_failure_reopens(clock):
+    _fail(4)
+    clock.sleep(31)
+    assert is_vendor_available("yfinance", "get_data")
+
+    _fail(1)
+    assert _state()["state"] == OPEN
+    assert _state()["times_opened"] == 2
+    assert not is_vendor_available("yfinance", "get_data")
+
+
+def test_unreported_probe_is_retried_after_open_seconds(clock):
+    _fail(4)
+    clock.sleep(31)
+    assert is_vendor_available("yfinance", "get_data")
+    clock.sleep(31)
+    assert is_vendor_available("yfinance", "get_data")
+
+
+def test_implementations_have_separate_circuits():
+    _fail(4, "local", "get_google_news")
+    assert not is_vendor_available("local", "get_google_news")
+    assert is_vendor_available("local", "get_finnhub_news")
+
+
+def test_disabled_breaker_never_refuses():
+    set_config({"vendor_circuit_breaker": {"enabled": False}})
+    _fail(10)
+    assert is_vendor_available("yfinance", "get_data")
+
+
+def test_timed_out_call_is_counted_once(monkeypatch):
+    # Real time here: the call runs on the vendor pool
+    monkeypatch.setattr(vendor_health, "time", time)
+    set_config({"vendor_timeout": 0.05, "tool_cache": {"enabled": False}})
+    release = threading.Event()
+    finished = threading.Event()
+
+    def hung_impl(symbol):
+        release.wait(5)
+        finished.set()
+        return "late data"
+
+    outcomes = interface._run_vendor_impls(
+        "get_stock_data", [(hung_impl, "slow_vendor")], ("NVDA",), {}, concurrent=True
+    )
+    assert outcomes == [(False, None)]
+
+    release.set()
+    assert finished.wait(5)
+    # Give the worker time to try to record its late success
+    for _ in range(100):
+        if not interface._is_stuck(("slow_vendor", "hung_impl")):
+            break
+        time.sleep(0.01)
+
+    stats = _state("slow_vendor", "hung_impl")
+    assert stats["calls"] == 1
+    assert stats["failures"] == 1
+    assert stats["last_error"].startswith("TimeoutError")
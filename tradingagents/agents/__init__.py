@@ -2,22 +2,22 @@ from .utils.agent_utils import create_msg_delete
 from .utils.agent_states import AgentState, InvestDebateState, RiskDebateState
 from .utils.memory import FinancialSituationMemory
 
-from .analysts.fundamentals_analyst import create_fundamentals_analyst
-from .analysts.market_analyst import create_market_analyst
-from .analysts.news_analyst import create_news_analyst
-from .analysts.social_media_analyst import create_social_media_analyst
+from .analysts.fundamentals_analyst import create_fundamentals_analyst, create_fundamentals_analyst_async
+from .analysts.market_analyst import create_market_analyst, create_market_analyst_async
+from .analysts.news_analyst import create_news_analyst, create_news_analyst_async
+from .analysts.social_media_analyst import create_social_media_analyst, create_social_media_analyst_async
 
-from .researchers.bear_researcher import create_bear_researcher
-from .researchers.bull_researcher import create_bull_researcher
+from .researchers.bear_researcher import create_bear_researcher, create_bear_researcher_async
+from .researchers.bull_researcher import create_bull_researcher, create_bull_researcher_async
 
-from .risk_mgmt.aggresive_debator import create_risky_debator
-from .risk_mgmt.conservative_debator import create_safe_debator
-from .risk_mgmt.neutral_debator import create_neutral_debator
+from .risk_mgmt.aggresive_debator import create_risky_debator, create_risky_debator_async
+from .risk_mgmt.conservative_debator import create_safe_debator, create_safe_debator_async
+from .risk_mgmt.neutral_debator import create_neutral_debator, create_neutral_debator_async
 
-from .managers.research_manager import create_research_manager
-from .managers.risk_manager import create_risk_manager
+from .managers.research_manager import create_research_manager, create_research_manager_async
+from .managers.risk_manager import create_risk_manager, create_risk_manager_async
 
-from .trader.trader import create_trader
+from .trader.trader import create_trader, create_trader_async
 
 __all__ = [
     "FinancialSituationMemory",
@@ -26,15 +26,27 @@ __all__ = [
     "InvestDebateState",
     "RiskDebateState",
     "create_bear_researcher",
+    "create_bear_researcher_async",
     "create_bull_researcher",
+    "create_bull_researcher_async",
     "create_research_manager",
+    "create_research_manager_async",
     "create_fundamentals_analyst",
+    "create_fundamentals_analyst_async",
     "create_market_analyst",
+    "create_market_analyst_async",
     "create_neutral_debator",
+    "create_neutral_debator_async",
     "create_news_analyst",
+    "create_news_analyst_async",
     "create_risky_debator",
+    "create_risky_debator_async",
     "create_risk_manager",
+    "create_risk_manager_async",
     "create_safe_debator",
+    "create_safe_debator_async",
     "create_social_media_analyst",
+    "create_social_media_analyst_async",
     "create_trader",
+    "create_trader_async",
 ]
@@ -1,25 +1,25 @@
+import asyncio
 import time
 import json
+from langchain_core.runnables import RunnableConfig
 
+from tradingagents.agents.utils.debate_utils import format_debate_history
+from tradingagents.agents.utils.memory import build_situation
+from tradingagents.dataflows.config import get_config
 
-def create_research_manager(llm, memory):
-    def research_manager_node(state) -> dict:
-        history = state["investment_debate_state"].get("history", "")
-        market_research_report = state["market_report"]
-        sentiment_report = state["sentiment_report"]
-        news_report = state["news_report"]
-        fundamentals_report = state["fundamentals_report"]
 
-        investment_debate_state = state["investment_debate_state"]
+def _build_research_manager_prompt(state, memory):
+    history = format_debate_history(
+        state["investment_debate_state"], get_config().get("debate_history_window")
+    )
+    curr_situation = build_situation(state)
+    past_memories = memory.get_memories(curr_situation, n_matches=2)
 
-        curr_situation = f"{market_research_report}\n\n{sentiment_report}\n\n{news_report}\n\n{fundamentals_report}"
-        past_memories = memory.get_memories(curr_situation, n_matches=2)
+    past_memory_str = ""
+    for i, rec in enumerate(past_memories, 1):
+        past_memory_str += rec["recommendation"] + "\n\n"
 
-        past_memory_str = ""
-        for i, rec in enumerate(past_memories, 1):
-            past_memory_str += rec["recommendation"] + "\n\n"
-
-        prompt = f"""As the portfolio manager and debate facilitator, your role is to critically evaluate this round of debate and make a definitive decision: align with the bear analyst, the bull analyst, or choose Hold only if it is strongly justified based on the arguments presented.
+    prompt = f"""As the portfolio manager and debate facilitator, your role is to critically evaluate this round of debate and make a definitive decision: align with the bear analyst, the bull analyst, or choose Hold only if it is strongly justified based on the arguments presented.
 
 Summarize the key points from both sides concisely, focusing on the most compelling evidence or reasoning. Your recommendation—Buy, Sell, or Hold—must be clear and actionable. Avoid defaulting to Hold simply because both sides have valid points; commit to a stance grounded in the debate's strongest arguments.
 
@@ -36,20 +36,39 @@ Here are your past reflections on mistakes:
 Here is the debate:
 Debate History:
 {history}"""
+    return prompt
+
+
+def _research_manager_state_update(state, response):
+    investment_debate_state = state["investment_debate_state"]
+
+    new_investment_debate_state = {
+        "judge_decision": response.content,
+        "current_response": response.content,
+        "turns": investment_debate_state.get("turns", []),
+        "count": investment_debate_state["count"],
+    }
+
+    return {
+        "investment_debate_state": new_investment_debate_state,
+        "investment_plan": response.content,
+    }
+
+
+def create_research_manager(llm, memory):
+    def research_manager_node(state) -> dict:
+        prompt = _build_research_manager_prompt(state, memory)
         response = llm.invoke(prompt)
+        return _research_manager_state_update(state, response)
+
+    return research_manager_node
+
 
-        new_investment_debate_state = {
-            "judge_decision": response.content,
-            "history": investment_debate_state.get("history", ""),
-            "bear_history": investment_debate_state.get("bear_history", ""),
-            "bull_history": investment_debate_state.get("bull_history", ""),
-            "current_response": response.content,
-            "count": investment_debate_state["count"],
-        }
-
-        return {
-            "investment_debate_state": new_investment_debate_state,
-            "investment_plan": response.content,
-        }
+def create_research_manager_async(llm, memory):
+    async def research_manager_node(state, config: RunnableConfig) -> dict:
+        # The memory lookup embeds the situation, a blocking request
+        prompt = await asyncio.to_thread(_build_research_manager_prompt, state, memory)
+        response = await llm.ainvoke(prompt, config)
+        return _research_manager_state_update(state, response)
 
     return research_manager_node
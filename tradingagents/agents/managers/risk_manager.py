@@ -1,28 +1,30 @@
+import asyncio
 import time
 import json
+from langchain_core.runnables import RunnableConfig
 
+from tradingagents.agents.utils.debate_utils import format_debate_history
+from tradingagents.agents.utils.memory import build_situation
+from tradingagents.dataflows.config import get_config
 
-def create_risk_manager(llm, memory):
-    def risk_manager_node(state) -> dict:
 
-        company_name = state["company_of_interest"]
+def _build_risk_manager_prompt(state, memory):
 
-        history = state["risk_debate_state"]["history"]
-        risk_debate_state = state["risk_debate_state"]
-        market_research_report = state["market_report"]
-        news_report = state["news_report"]
-        fundamentals_report = state["news_report"]
-        sentiment_report = state["sentiment_report"]
-        trader_plan = state["investment_plan"]
+    company_name = state["company_of_interest"]
 
-        curr_situation = f"{market_research_report}\n\n{sentiment_report}\n\n{news_report}\n\n{fundamentals_report}"
-        past_memories = memory.get_memories(curr_situation, n_matches=2)
+    history = format_debate_history(
+        state["risk_debate_state"], get_config().get("debate_history_window")
+    )
+    trader_plan = state["investment_plan"]
 
-        past_memory_str = ""
-        for i, rec in enumerate(past_memories, 1):
-            past_memory_str += rec["recommendation"] + "\n\n"
+    curr_situation = build_situation(state)
+    past_memories = memory.get_memories(curr_situation, n_matches=2)
 
-        prompt = f"""As the Risk Management Judge and Debate Facilitator, your goal is to evaluate the debate between three risk analysts—Risky, Neutral, and Safe/Conservative—and determine the best course of action for the trader. Your decision must result in a clear recommendation: Buy, Sell, or Hold. Choose Hold only if strongly justified by specific arguments, not as a fallback when all sides seem valid. Strive for clarity and decisiveness.
+    past_memory_str = ""
+    for i, rec in enumerate(past_memories, 1):
+        past_memory_str += rec["recommendation"] + "\n\n"
+
+    prompt = f"""As the Risk Management Judge and Debate Facilitator, your goal is to evaluate the debate between three risk analysts—Risky, Neutral, and Safe/Conservative—and determine the best course of action for the trader. Your decision must result in a clear recommendation: Buy, Sell, or Hold. Choose Hold only if strongly justified by specific arguments, not as a fallback when all sides seem valid. Strive for clarity and decisiveness.
 
 Guidelines for Decision-Making:
 1. **Summarize Key Arguments**: Extract the strongest points from each analyst, focusing on relevance to the context.
@@ -42,25 +44,42 @@ Deliverables:
 ---
 
 Focus on actionable insights and continuous improvement. Build on past lessons, critically evaluate all perspectives, and ensure each decision advances better outcomes."""
+    return prompt
+
+
+def _risk_manager_state_update(state, response):
+    risk_debate_state = state["risk_debate_state"]
+
+    new_risk_debate_state = {
+        "judge_decision": response.content,
+        "latest_speaker": "Judge",
+        "current_risky_response": risk_debate_state["current_risky_response"],
+        "current_safe_response": risk_debate_state["current_safe_response"],
+        "current_neutral_response": risk_debate_state["current_neutral_response"],
+        "turns": risk_debate_state.get("turns", []),
+        "count": risk_debate_state["count"],
+    }
+
+    return {
+        "risk_debate_state": new_risk_debate_state,
+        "final_trade_decision": response.content,
+    }
 
+
+def create_risk_manager(llm, memory):
+    def risk_manager_node(state) -> dict:
+        prompt = _build_risk_manager_prompt(state, memory)
         response = llm.invoke(prompt)
+        return _risk_manager_state_update(state, response)
+
+    return risk_manager_node
+
 
-        new_risk_debate_state = {
-            "judge_decision": response.content,
-            "history": risk_debate_state["history"],
-            "risky_history": risk_debate_state["risky_history"],
-            "safe_history": risk_debate_state["safe_history"],
-            "neutral_history": risk_debate_state["neutral_history"],
-            "latest_speaker": "Judge",
-            "current_risky_response": risk_debate_state["current_risky_response"],
-            "current_safe_response": risk_debate_state["current_safe_response"],
-            "current_neutral_response": risk_debate_state["current_neutral_response"],
-            "count": risk_debate_state["count"],
-        }
-
-        return {
-            "risk_debate_state": new_risk_debate_state,
-            "final_trade_decision": response.content,
-        }
+def create_risk_manager_async(llm, memory):
+    async def risk_manager_node(state, config: RunnableConfig) -> dict:
+        # The memory lookup embeds the situation, a blocking request
+        prompt = await asyncio.to_thread(_build_risk_manager_prompt, state, memory)
+        response = await llm.ainvoke(prompt, config)
+        return _risk_manager_state_update(state, response)
 
     return risk_manager_node
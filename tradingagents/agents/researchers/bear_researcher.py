@@ -1,28 +1,30 @@
 from langchain_core.messages import AIMessage
+import asyncio
 import time
 import json
+from langchain_core.runnables import RunnableConfig
 
+from tradingagents.agents.utils.debate_utils import append_turn, format_debate_history
+from tradingagents.agents.utils.memory import build_situation
+from tradingagents.agents.utils.prompt_utils import assemble_prompt
+from tradingagents.dataflows.config import get_config
 
-def create_bear_researcher(llm, memory):
-    def bear_node(state) -> dict:
-        investment_debate_state = state["investment_debate_state"]
-        history = investment_debate_state.get("history", "")
-        bear_history = investment_debate_state.get("bear_history", "")
 
-        current_response = investment_debate_state.get("current_response", "")
-        market_research_report = state["market_report"]
-        sentiment_report = state["sentiment_report"]
-        news_report = state["news_report"]
-        fundamentals_report = state["fundamentals_report"]
+def _build_bear_prompt(state, memory):
+    investment_debate_state = state["investment_debate_state"]
+    history = format_debate_history(
+        investment_debate_state, get_config().get("debate_history_window")
+    )
 
-        curr_situation = f"{market_research_report}\n\n{sentiment_report}\n\n{news_report}\n\n{fundamentals_report}"
-        past_memories = memory.get_memories(curr_situation, n_matches=2)
+    current_response = investment_debate_state.get("current_response", "")
+    curr_situation = build_situation(state)
+    past_memories = memory.get_memories(curr_situation, n_matches=2)
 
-        past_memory_str = ""
-        for i, rec in enumerate(past_memories, 1):
-            past_memory_str += rec["recommendation"] + "\n\n"
+    past_memory_str = ""
+    for i, rec in enumerate(past_memories, 1):
+        past_memory_str += rec["recommendation"] + "\n\n"
 
-        prompt = f"""You are a Bear Analyst making the case against investing in the stock. Your goal is to present a well-reasoned argument emphasizing risks, challenges, and negative indicators. Leverage the provided research and data to highlight potential downsides and counter bullish arguments effectively.
+    instructions = """You are a Bear Analyst making the case against investing in the stock. Your goal is to present a well-reasoned argument emphasizing risks, challenges, and negative indicators. Leverage the analyst reports above to highlight potential downsides and counter bullish arguments effectively.
 
 Key points to focus on:
 
@@ -30,32 +32,43 @@ Key points to focus on:
 - Competitive Weaknesses: Emphasize vulnerabilities such as weaker market positioning, declining innovation, or threats from competitors.
 - Negative Indicators: Use evidence from financial data, market trends, or recent adverse news to support your position.
 - Bull Counterpoints: Critically analyze the bull argument with specific data and sound reasoning, exposing weaknesses or over-optimistic assumptions.
-- Engagement: Present your argument in a conversational style, directly engaging with the bull analyst's points and debating effectively rather than simply listing facts.
-
-Resources available:
-
-Market research report: {market_research_report}
-Social media sentiment report: {sentiment_report}
-Latest world affairs news: {news_report}
-Company fundamentals report: {fundamentals_report}
+- Engagement: Present your argument in a conversational style, directly engaging with the bull analyst's points and debating effectively rather than simply listing facts."""
+    context = f"""Reflections from similar situations and lessons learned: {past_memory_str}
 Conversation history of the debate: {history}
 Last bull argument: {current_response}
-Reflections from similar situations and lessons learned: {past_memory_str}
 Use this information to deliver a compelling bear argument, refute the bull's claims, and engage in a dynamic debate that demonstrates the risks and weaknesses of investing in the stock. You must also address reflections and learn from lessons and mistakes you made in the past.
 """
+    return assemble_prompt(state, instructions, context)
+
+
+def _bear_state_update(state, response):
+    investment_debate_state = state["investment_debate_state"]
+
+    argument = f"Bear Analyst: {response.content}"
 
+    new_investment_debate_state = {
+        "current_response": argument,
+        "turns": append_turn(investment_debate_state.get("turns"), "Bear", argument),
+        "count": investment_debate_state["count"] + 1,
+    }
+
+    return {"investment_debate_state": new_investment_debate_state}
+
+
+def create_bear_researcher(llm, memory):
+    def bear_node(state) -> dict:
+        prompt = _build_bear_prompt(state, memory)
         response = llm.invoke(prompt)
+        return _bear_state_update(state, response)
 
-        argument = f"Bear Analyst: {response.content}"
+    return bear_node
 
-        new_investment_debate_state = {
-            "history": history + "\n" + argument,
-            "bear_history": bear_history + "\n" + argument,
-            "bull_history": investment_debate_state.get("bull_history", ""),
-            "current_response": argument,
-            "count": investment_debate_state["count"] + 1,
-        }
 
-        return {"investment_debate_state": new_investment_debate_state}
+def create_bear_researcher_async(llm, memory):
+    async def bear_node(state, config: RunnableConfig) -> dict:
+        # The memory lookup embeds the situation, a blocking request
+        prompt = await asyncio.to_thread(_build_bear_prompt, state, memory)
+        response = await llm.ainvoke(prompt, config)
+        return _bear_state_update(state, response)
 
     return bear_node
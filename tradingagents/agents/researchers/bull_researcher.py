@@ -1,59 +1,73 @@
 from langchain_core.messages import AIMessage
+import asyncio
 import time
 import json
+from langchain_core.runnables import RunnableConfig
 
+from tradingagents.agents.utils.debate_utils import append_turn, format_debate_history
+from tradingagents.agents.utils.memory import build_situation
+from tradingagents.agents.utils.prompt_utils import assemble_prompt
+from tradingagents.dataflows.config import get_config
 
-def create_bull_researcher(llm, memory):
-    def bull_node(state) -> dict:
-        investment_debate_state = state["investment_debate_state"]
-        history = investment_debate_state.get("history", "")
-        bull_history = investment_debate_state.get("bull_history", "")
 
-        current_response = investment_debate_state.get("current_response", "")
-        market_research_report = state["market_report"]
-        sentiment_report = state["sentiment_report"]
-        news_report = state["news_report"]
-        fundamentals_report = state["fundamentals_report"]
+def _build_bull_prompt(state, memory):
+    investment_debate_state = state["investment_debate_state"]
+    history = format_debate_history(
+        investment_debate_state, get_config().get("debate_history_window")
+    )
 
-        curr_situation = f"{market_research_report}\n\n{sentiment_report}\n\n{news_report}\n\n{fundamentals_report}"
-        past_memories = memory.get_memories(curr_situation, n_matches=2)
+    current_response = investment_debate_state.get("current_response", "")
+    curr_situation = build_situation(state)
+    past_memories = memory.get_memories(curr_situation, n_matches=2)
 
-        past_memory_str = ""
-        for i, rec in enumerate(past_memories, 1):
-            past_memory_str += rec["recommendation"] + "\n\n"
+    past_memory_str = ""
+    for i, rec in enumerate(past_memories, 1):
+        past_memory_str += rec["recommendation"] + "\n\n"
 
-        prompt = f"""You are a Bull Analyst advocating for investing in the stock. Your task is to build a strong, evidence-based case emphasizing growth potential, competitive advantages, and positive market indicators. Leverage the provided research and data to address concerns and counter bearish arguments effectively.
+    instructions = """You are a Bull Analyst advocating for investing in the stock. Your task is to build a strong, evidence-based case emphasizing growth potential, competitive advantages, and positive market indicators. Leverage the analyst reports above to address concerns and counter bearish arguments effectively.
 
 Key points to focus on:
 - Growth Potential: Highlight the company's market opportunities, revenue projections, and scalability.
 - Competitive Advantages: Emphasize factors like unique products, strong branding, or dominant market positioning.
 - Positive Indicators: Use financial health, industry trends, and recent positive news as evidence.
 - Bear Counterpoints: Critically analyze the bear argument with specific data and sound reasoning, addressing concerns thoroughly and showing why the bull perspective holds stronger merit.
-- Engagement: Present your argument in a conversational style, engaging directly with the bear analyst's points and debating effectively rather than just listing data.
-
-Resources available:
-Market research report: {market_research_report}
-Social media sentiment report: {sentiment_report}
-Latest world affairs news: {news_report}
-Company fundamentals report: {fundamentals_report}
+- Engagement: Present your argument in a conversational style, engaging directly with the bear analyst's points and debating effectively rather than just listing data."""
+    context = f"""Reflections from similar situations and lessons learned: {past_memory_str}
 Conversation history of the debate: {history}
 Last bear argument: {current_response}
-Reflections from similar situations and lessons learned: {past_memory_str}
 Use this information to deliver a compelling bull argument, refute the bear's concerns, and engage in a dynamic debate that demonstrates the strengths of the bull position. You must also address reflections and learn from lessons and mistakes you made in the past.
 """
+    return assemble_prompt(state, instructions, context)
+
+
+def _bull_state_update(state, response):
+    investment_debate_state = state["investment_debate_state"]
+
+    argument = f"Bull Analyst: {response.content}"
 
+    new_investment_debate_state = {
+        "current_response": argument,
+        "turns": append_turn(investment_debate_state.get("turns"), "Bull", argument),
+        "count": investment_debate_state["count"] + 1,
+    }
+
+    return {"investment_debate_state": new_investment_debate_state}
+
+
+def create_bull_researcher(llm, memory):
+    def bull_node(state) -> dict:
+        prompt = _build_bull_prompt(state, memory)
         response = llm.invoke(prompt)
+        return _bull_state_update(state, response)
 
-        argument = f"Bull Analyst: {response.content}"
+    return bull_node
 
-        new_investment_debate_state = {
-            "history": history + "\n" + argument,
-            "bull_history": bull_history + "\n" + argument,
-            "bear_history": investment_debate_state.get("bear_history", ""),
-            "current_response": argument,
-            "count": investment_debate_state["count"] + 1,
-        }
 
-        return {"investment_debate_state": new_investment_debate_state}
+def create_bull_researcher_async(llm, memory):
+    async def bull_node(state, config: RunnableConfig) -> dict:
+        # The memory lookup embeds the situation, a blocking request
+        prompt = await asyncio.to_thread(_build_bull_prompt, state, memory)
+        response = await llm.ainvoke(prompt, config)
+        return _bull_state_update(state, response)
 
     return bull_node
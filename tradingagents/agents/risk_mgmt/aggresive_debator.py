@@ -1,55 +1,67 @@
+import asyncio
 import time
 import json
+from langchain_core.runnables import RunnableConfig
 
+from tradingagents.agents.utils.debate_utils import append_turn, format_debate_history
+from tradingagents.agents.utils.prompt_utils import assemble_prompt
+from tradingagents.dataflows.config import get_config
 
-def create_risky_debator(llm):
-    def risky_node(state) -> dict:
-        risk_debate_state = state["risk_debate_state"]
-        history = risk_debate_state.get("history", "")
-        risky_history = risk_debate_state.get("risky_history", "")
 
-        current_safe_response = risk_debate_state.get("current_safe_response", "")
-        current_neutral_response = risk_debate_state.get("current_neutral_response", "")
+def _build_risky_prompt(state):
+    risk_debate_state = state["risk_debate_state"]
+    history = format_debate_history(
+        risk_debate_state, get_config().get("debate_history_window")
+    )
 
-        market_research_report = state["market_report"]
-        sentiment_report = state["sentiment_report"]
-        news_report = state["news_report"]
-        fundamentals_report = state["fundamentals_report"]
+    current_safe_response = risk_debate_state.get("current_safe_response", "")
+    current_neutral_response = risk_debate_state.get("current_neutral_response", "")
 
-        trader_decision = state["trader_investment_plan"]
+    trader_decision = state["trader_investment_plan"]
 
-        prompt = f"""As the Risky Risk Analyst, your role is to actively champion high-reward, high-risk opportunities, emphasizing bold strategies and competitive advantages. When evaluating the trader's decision or plan, focus intently on the potential upside, growth potential, and innovative benefits—even when these come with elevated risk. Use the provided market data and sentiment analysis to strengthen your arguments and challenge the opposing views. Specifically, respond directly to each point made by the conservative and neutral analysts, countering with data-driven rebuttals and persuasive reasoning. Highlight where their caution might miss critical opportunities or where their assumptions may be overly conservative. Here is the trader's decision:
+    instructions = f"""As the Risky Risk Analyst, your role is to actively champion high-reward, high-risk opportunities, emphasizing bold strategies and competitive advantages. When evaluating the trader's decision or plan, focus intently on the potential upside, growth potential, and innovative benefits—even when these come with elevated risk. Use the provided market data and sentiment analysis to strengthen your arguments and challenge the opposing views. Specifically, respond directly to each point made by the conservative and neutral analysts, countering with data-driven rebuttals and persuasive reasoning. Highlight where their caution might miss critical opportunities or where their assumptions may be overly conservative. Here is the trader's decision:
 
 {trader_decision}
 
-Your task is to create a compelling case for the trader's decision by questioning and critiquing the conservative and neutral stances to demonstrate why your high-reward perspective offers the best path forward. Incorporate insights from the following sources into your arguments:
-
-Market Research Report: {market_research_report}
-Social Media Sentiment Report: {sentiment_report}
-Latest World Affairs Report: {news_report}
-Company Fundamentals Report: {fundamentals_report}
-Here is the current conversation history: {history} Here are the last arguments from the conservative analyst: {current_safe_response} Here are the last arguments from the neutral analyst: {current_neutral_response}. If there are no responses from the other viewpoints, do not halluncinate and just present your point.
+Your task is to create a compelling case for the trader's decision by questioning and critiquing the conservative and neutral stances to demonstrate why your high-reward perspective offers the best path forward. Incorporate insights from the analyst reports above into your arguments."""
+    context = f"""Here is the current conversation history: {history} Here are the last arguments from the conservative analyst: {current_safe_response} Here are the last arguments from the neutral analyst: {current_neutral_response}. If there are no responses from the other viewpoints, do not halluncinate and just present your point.
 
 Engage actively by addressing any specific concerns raised, refuting the weaknesses in their logic, and asserting the benefits of risk-taking to outpace market norms. Maintain a focus on debating and persuading, not just presenting data. Challenge each counterpoint to underscore why a high-risk approach is optimal. Output conversationally as if you are speaking without any special formatting."""
+    return assemble_prompt(state, instructions, context)
+
+
+def _risky_state_update(state, response):
+    risk_debate_state = state["risk_debate_state"]
+
+    argument = f"Risky Analyst: {response.content}"
+
+    new_risk_debate_state = {
+        "latest_speaker": "Risky",
+        "current_risky_response": argument,
+        "current_safe_response": risk_debate_state.get("current_safe_response", ""),
+        "current_neutral_response": risk_debate_state.get(
+            "current_neutral_response", ""
+        ),
+        "turns": append_turn(risk_debate_state.get("turns"), "Risky", argument),
+        "count": risk_debate_state["count"] + 1,
+    }
 
+    return {"risk_debate_state": new_risk_debate_state}
+
+
+def create_risky_debator(llm):
+    def risky_node(state) -> dict:
+        prompt = _build_risky_prompt(state)
         response = llm.invoke(prompt)
+        return _risky_state_update(state, response)
+
+    return risky_node
+
 
-        argument = f"Risky Analyst: {response.content}"
-
-        new_risk_debate_state = {
-            "history": history + "\n" + argument,
-            "risky_history": risky_history + "\n" + argument,
-            "safe_history": risk_debate_state.get("safe_history", ""),
-            "neutral_history": risk_debate_state.get("neutral_history", ""),
-            "latest_speaker": "Risky",
-            "current_risky_response": argument,
-            "current_safe_response": risk_debate_state.get("current_safe_response", ""),
-            "current_neutral_response": risk_debate_state.get(
-                "current_neutral_response", ""
-            ),
-            "count": risk_debate_state["count"] + 1,
-        }
-
-        return {"risk_debate_state": new_risk_debate_state}
+def create_risky_debator_async(llm):
+    async def risky_node(state, config: RunnableConfig) -> dict:
+        prompt = _build_risky_prompt(state)
+        response = await llm.ainvoke(prompt, config)
+        return _risky_state_update(state, response)
 
     return risky_node
@@ -1,58 +1,70 @@
 from langchain_core.messages import AIMessage
+import asyncio
 import time
 import json
+from langchain_core.runnables import RunnableConfig
 
+from tradingagents.agents.utils.debate_utils import append_turn, format_debate_history
+from tradingagents.agents.utils.prompt_utils import assemble_prompt
+from tradingagents.dataflows.config import get_config
 
-def create_safe_debator(llm):
-    def safe_node(state) -> dict:
-        risk_debate_state = state["risk_debate_state"]
-        history = risk_debate_state.get("history", "")
-        safe_history = risk_debate_state.get("safe_history", "")
 
-        current_risky_response = risk_debate_state.get("current_risky_response", "")
-        current_neutral_response = risk_debate_state.get("current_neutral_response", "")
+def _build_safe_prompt(state):
+    risk_debate_state = state["risk_debate_state"]
+    history = format_debate_history(
+        risk_debate_state, get_config().get("debate_history_window")
+    )
 
-        market_research_report = state["market_report"]
-        sentiment_report = state["sentiment_report"]
-        news_report = state["news_report"]
-        fundamentals_report = state["fundamentals_report"]
+    current_risky_response = risk_debate_state.get("current_risky_response", "")
+    current_neutral_response = risk_debate_state.get("current_neutral_response", "")
 
-        trader_decision = state["trader_investment_plan"]
+    trader_decision = state["trader_investment_plan"]
 
-        prompt = f"""As the Safe/Conservative Risk Analyst, your primary objective is to protect assets, minimize volatility, and ensure steady, reliable growth. You prioritize stability, security, and risk mitigation, carefully assessing potential losses, economic downturns, and market volatility. When evaluating the trader's decision or plan, critically examine high-risk elements, pointing out where the decision may expose the firm to undue risk and where more cautious alternatives could secure long-term gains. Here is the trader's decision:
+    instructions = f"""As the Safe/Conservative Risk Analyst, your primary objective is to protect assets, minimize volatility, and ensure steady, reliable growth. You prioritize stability, security, and risk mitigation, carefully assessing potential losses, economic downturns, and market volatility. When evaluating the trader's decision or plan, critically examine high-risk elements, pointing out where the decision may expose the firm to undue risk and where more cautious alternatives could secure long-term gains. Here is the trader's decision:
 
 {trader_decision}
 
-Your task is to actively counter the arguments of the Risky and Neutral Analysts, highlighting where their views may overlook potential threats or fail to prioritize sustainability. Respond directly to their points, drawing from the following data sources to build a convincing case for a low-risk approach adjustment to the trader's decision:
-
-Market Research Report: {market_research_report}
-Social Media Sentiment Report: {sentiment_report}
-Latest World Affairs Report: {news_report}
-Company Fundamentals Report: {fundamentals_report}
-Here is the current conversation history: {history} Here is the last response from the risky analyst: {current_risky_response} Here is the last response from the neutral analyst: {current_neutral_response}. If there are no responses from the other viewpoints, do not halluncinate and just present your point.
+Your task is to actively counter the arguments of the Risky and Neutral Analysts, highlighting where their views may overlook potential threats or fail to prioritize sustainability. Respond directly to their points, drawing from the analyst reports above to build a convincing case for a low-risk approach adjustment to the trader's decision."""
+    context = f"""Here is the current conversation history: {history} Here is the last response from the risky analyst: {current_risky_response} Here is the last response from the neutral analyst: {current_neutral_response}. If there are no responses from the other viewpoints, do not halluncinate and just present your point.
 
 Engage by questioning their optimism and emphasizing the potential downsides they may have overlooked. Address each of their counterpoints to showcase why a conservative stance is ultimately the safest path for the firm's assets. Focus on debating and critiquing their arguments to demonstrate the strength of a low-risk strategy over their approaches. Output conversationally as if you are speaking without any special formatting."""
+    return assemble_prompt(state, instructions, context)
+
+
+def _safe_state_update(state, response):
+    risk_debate_state = state["risk_debate_state"]
+
+    argument = f"Safe Analyst: {response.content}"
+
+    new_risk_debate_state = {
+        "latest_speaker": "Safe",
+        "current_risky_response": risk_debate_state.get(
+            "current_risky_response", ""
+        ),
+        "current_safe_response": argument,
+        "current_neutral_response": risk_debate_state.get(
+            "current_neutral_response", ""
+        ),
+        "turns": append_turn(risk_debate_state.get("turns"), "Safe", argument),
+        "count": risk_debate_state["count"] + 1,
+    }
 
+    return {"risk_debate_state": new_risk_debate_state}
+
+
+def create_safe_debator(llm):
+    def safe_node(state) -> dict:
+        prompt = _build_safe_prompt(state)
         response = llm.invoke(prompt)
+        return _safe_state_update(state, response)
+
+    return safe_node
+
 
-        argument = f"Safe Analyst: {response.content}"
-
-        new_risk_debate_state = {
-            "history": history + "\n" + argument,
-            "risky_history": risk_debate_state.get("risky_history", ""),
-            "safe_history": safe_history + "\n" + argument,
-            "neutral_history": risk_debate_state.get("neutral_history", ""),
-            "latest_speaker": "Safe",
-            "current_risky_response": risk_debate_state.get(
-                "current_risky_response", ""
-            ),
-            "current_safe_response": argument,
-            "current_neutral_response": risk_debate_state.get(
-                "current_neutral_response", ""
-            ),
-            "count": risk_debate_state["count"] + 1,
-        }
-
-        return {"risk_debate_state": new_risk_debate_state}
+def create_safe_debator_async(llm):
+    async def safe_node(state, config: RunnableConfig) -> dict:
+        prompt = _build_safe_prompt(state)
+        response = await llm.ainvoke(prompt, config)
+        return _safe_state_update(state, response)
 
     return safe_node
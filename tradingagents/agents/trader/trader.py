@@ -1,46 +1,62 @@
+import asyncio
 import functools
 import time
 import json
+from langchain_core.runnables import RunnableConfig
+
+from tradingagents.agents.utils.memory import build_situation
+
+
+def _build_trader_messages(state, memory):
+    company_name = state["company_of_interest"]
+    investment_plan = state["investment_plan"]
+    curr_situation = build_situation(state)
+    past_memories = memory.get_memories(curr_situation, n_matches=2)
+
+    past_memory_str = ""
+    if past_memories:
+        for i, rec in enumerate(past_memories, 1):
+            past_memory_str += rec["recommendation"] + "\n\n"
+    else:
+        past_memory_str = "No past memories found."
+
+    context = {
+        "role": "user",
+        "content": f"Based on a comprehensive analysis by a team of analysts, here is an investment plan tailored for {company_name}. This plan incorporates insights from current technical market trends, macroeconomic indicators, and social media sentiment. Use this plan as a foundation for evaluating your next trading decision.\n\nProposed Investment Plan: {investment_plan}\n\nLeverage these insights to make an informed and strategic decision.",
+    }
+
+    messages = [
+        {
+            "role": "system",
+            "content": f"""You are a trading agent analyzing market data to make investment decisions. Based on your analysis, provide a specific recommendation to buy, sell, or hold. End with a firm decision and always conclude your response with 'FINAL TRANSACTION PROPOSAL: **BUY/HOLD/SELL**' to confirm your recommendation. Do not forget to utilize lessons from past decisions to learn from your mistakes. Here is some reflections from similar situatiosn you traded in and the lessons learned: {past_memory_str}""",
+        },
+        context,
+    ]
+    return messages
+
+
+def _trader_state_update(state, result, name):
+    return {
+        "messages": [result],
+        "trader_investment_plan": result.content,
+        "sender": name,
+    }
 
 
 def create_trader(llm, memory):
     def trader_node(state, name):
-        company_name = state["company_of_interest"]
-        investment_plan = state["investment_plan"]
-        market_research_report = state["market_report"]
-        sentiment_report = state["sentiment_report"]
-        news_report = state["news_report"]
-        fundamentals_report = state["fundamentals_report"]
-
-        curr_situation = f"{market_research_report}\n\n{sentiment_report}\n\n{news_report}\n\n{fundamentals_report}"
-        past_memories = memory.get_memories(curr_situation, n_matches=2)
-
-        past_memory_str = ""
-        if past_memories:
-            for i, rec in enumerate(past_memories, 1):
-                past_memory_str += rec["recommendation"] + "\n\n"
-        else:
-            past_memory_str = "No past memories found."
-
-        context = {
-            "role": "user",
-            "content": f"Based on a comprehensive analysis by a team of analysts, here is an investment plan tailored for {company_name}. This plan incorporates insights from current technical market trends, macroeconomic indicators, and social media sentiment. Use this plan as a foundation for evaluating your next trading decision.\n\nProposed Investment Plan: {investment_plan}\n\nLeverage these insights to make an informed and strategic decision.",
-        }
-
-        messages = [
-            {
-                "role": "system",
-                "content": f"""You are a trading agent analyzing market data to make investment decisions. Based on your analysis, provide a specific recommendation to buy, sell, or hold. End with a firm decision and always conclude your response with 'FINAL TRANSACTION PROPOSAL: **BUY/HOLD/SELL**' to confirm your recommendation. Do not forget to utilize lessons from past decisions to learn from your mistakes. Here is some reflections from similar situatiosn you traded in and the lessons learned: {past_memory_str}""",
-            },
-            context,
-        ]
-
+        messages = _build_trader_messages(state, memory)
         result = llm.invoke(messages)
+        return _trader_state_update(state, result, name)
+
+    return functools.partial(trader_node, name="Trader")
+
 
-        return {
-            "messages": [result],
-            "trader_investment_plan": result.content,
-            "sender": name,
-        }
+def create_trader_async(llm, memory):
+    async def trader_node(state, config: RunnableConfig, name):
+        # The memory lookup embeds the situation, a blocking request
+        messages = await asyncio.to_thread(_build_trader_messages, state, memory)
+        result = await llm.ainvoke(messages, config)
+        return _trader_state_update(state, result, name)
 
     return functools.partial(trader_node, name="Trader")
@@ -9,30 +9,14 @@ from langgraph.graph import END, StateGraph, START, MessagesState
 
 # Researcher team state
 class InvestDebateState(TypedDict):
-    bull_history: Annotated[
-        str, "Bullish Conversation history"
-    ]  # Bullish Conversation history
-    bear_history: Annotated[
-        str, "Bearish Conversation history"
-    ]  # Bullish Conversation history
-    history: Annotated[str, "Conversation history"]  # Conversation history
     current_response: Annotated[str, "Latest response"]  # Last response
     judge_decision: Annotated[str, "Final judge decision"]  # Last response
+    turns: Annotated[list, "Speaker and argument of each turn, oldest first"]
     count: Annotated[int, "Length of the current conversation"]  # Conversation length
 
 
 # Risk management team state
 class RiskDebateState(TypedDict):
-    risky_history: Annotated[
-        str, "Risky Agent's Conversation history"
-    ]  # Conversation history
-    safe_history: Annotated[
-        str, "Safe Agent's Conversation history"
-    ]  # Conversation history
-    neutral_history: Annotated[
-        str, "Neutral Agent's Conversation history"
-    ]  # Conversation history
-    history: Annotated[str, "Conversation history"]  # Conversation history
     latest_speaker: Annotated[str, "Analyst that spoke last"]
     current_risky_response: Annotated[
         str, "Latest response by the risky analyst"
@@ -44,6 +28,7 @@ class RiskDebateState(TypedDict):
         str, "Latest response by the neutral analyst"
     ]  # Last response
     judge_decision: Annotated[str, "Judge's decision"]
+    turns: Annotated[list, "Speaker and argument of each turn, oldest first"]
     count: Annotated[int, "Length of the current conversation"]  # Conversation length
 
 
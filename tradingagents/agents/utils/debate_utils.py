@@ -0,0 +1,66 @@
+import re
+from typing import List, Optional
+
+# Longest excerpt kept per turn in the summary of earlier turns
+SUMMARY_EXCERPT_CHARS = 300
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s")
+
+
+def append_turn(turns: Optional[List[dict]], speaker: str, argument: str) -> List[dict]:
+    """Return a new turn list with argument appended; the input list is not modified."""
+    return list(turns or []) + [{"speaker": speaker, "argument": argument}]
+
+
+def debate_transcript(debate_state: dict, speaker: Optional[str] = None) -> str:
+    """Every argument of the debate (or of one speaker), oldest first.
+
+    The turn list is the debate's only record; this is the history string
+    for consumers that show or reflect on the whole debate.
+    """
+    return "\n".join(
+        turn["argument"]
+        for turn in debate_state.get("turns") or []
+        if speaker is None or turn["speaker"] == speaker
+    )
+
+
+def latest_argument(debate_state: dict, speaker: str) -> str:
+    """The speaker's most recent argument, or "" if they have not spoken."""
+    for turn in reversed(debate_state.get("turns") or []):
+        if turn["speaker"] == speaker:
+            return turn["argument"]
+    return ""
+
+
+def _summarize_turn(argument: str) -> str:
+    """First sentence of a turn, capped at SUMMARY_EXCERPT_CHARS."""
+    text = " ".join(argument.split())
+    excerpt = _SENTENCE_END.split(text, maxsplit=1)[0]
+    if len(excerpt) > SUMMARY_EXCERPT_CHARS:
+        excerpt = excerpt[:SUMMARY_EXCERPT_CHARS].rstrip() + "..."
+    return excerpt
+
+
+def format_debate_history(debate_state: dict, window: Optional[int] = None) -> str:
+    """Debate history for a prompt, bounded to the last window turns.
+
+    With window None, or at most window turns so far, this is the full
+    transcript. Otherwise the most recent window turns are kept verbatim and
+    every earlier turn is reduced to its opening sentence, so the prompt
+    grows by one short line per round instead of a full argument.
+    """
+    turns = debate_state.get("turns") or []
+    if window is None or len(turns) <= window:
+        return debate_transcript(debate_state)
+
+    earlier = turns[: len(turns) - window] if window > 0 else turns
+    recent = turns[len(turns) - window :] if window > 0 else []
+
+    summary = "\n".join(f"- {_summarize_turn(turn['argument'])}" for turn in earlier)
+    history = f"\n[Summary of {len(earlier)} earlier turns]\n{summary}"
+    if recent:
+        history += "\n[Most recent turns]\n" + "\n".join(
+            turn["argument"] for turn in recent
+        )
+    return history
@@ -1,7 +1,214 @@
-import chromadb
-from chromadb.config import Settings
+import hashlib
+import json
+import os
+import threading
+import uuid
+
+import numpy as np
 from openai import OpenAI
 
+try:
+    import fcntl
+except ImportError:  # not available on Windows; concurrent appends are then unguarded
+    fcntl = None
+
+from tradingagents.dataflows.utils import LRUCache
+
+# Embeddings shared by every memory instance, keyed by (model, text) hash, so
+# the situation queried by all five memories is only embedded once
+_EMBEDDING_CACHE = LRUCache(maxsize=4096)
+
+# Inputs sent per embeddings.create request
+EMBEDDING_BATCH_SIZE = 256
+
+
+# One Chroma client per persist directory, shared by all memories using it
+_PERSISTENT_CLIENTS = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+def build_situation(state):
+    """The four analyst reports as one text, the key lessons are stored and looked up under.
+
+    Every memory lookup of a run and the reflection that stores its lessons
+    use this same text, so it is embedded once per run.
+    """
+    return "\n\n".join(
+        state[key]
+        for key in ("market_report", "sentiment_report", "news_report", "fundamentals_report")
+    )
+
+
+def _embedding_key(model, text):
+    return hashlib.sha256(f"{model}\0{text}".encode()).hexdigest()
+
+
+def _get_chroma_client(persist_dir):
+    """In-memory client, or the shared PersistentClient for persist_dir."""
+    # Imported here so the numpy backend never loads chromadb
+    import chromadb
+    from chromadb.config import Settings
+
+    if not persist_dir:
+        return chromadb.Client(Settings(allow_reset=True))
+
+    persist_dir = os.path.abspath(persist_dir)
+    with _CLIENTS_LOCK:
+        client = _PERSISTENT_CLIENTS.get(persist_dir)
+        if client is None:
+            os.makedirs(persist_dir, exist_ok=True)
+            client = chromadb.PersistentClient(
+                path=persist_dir, settings=Settings(allow_reset=True)
+            )
+            _PERSISTENT_CLIENTS[persist_dir] = client
+        return client
+
+
+class NumpySituationCollection:
+    """Exact kNN over a contiguous float32 matrix of unit-norm embeddings.
+
+    Implements the part of the Chroma collection API used by
+    FinancialSituationMemory (count, add, query). Distances are squared L2
+    between normalized vectors, which is what Chroma's default space returns
+    for normalized embeddings, so similarity_score keeps its meaning. With a
+    persist_dir each add appends its rows to {name}.f32 (raw float32, memory-
+    mapped on load) and one JSON line per row to {name}.jsonl, so saving
+    costs only the new rows.
+    """
+
+    def __init__(self, name, persist_dir=None):
+        self.name = name
+        self.persist_dir = persist_dir
+        self.matrix = None
+        self.documents = []
+        self.metadatas = []
+        self.ids = []
+        self._lock = threading.Lock()
+        if persist_dir:
+            self._load()
+
+    def _paths(self):
+        base = os.path.join(self.persist_dir, self.name)
+        return base + ".f32", base + ".jsonl"
+
+    def _load(self):
+        matrix_path, records_path = self._paths()
+        if not (os.path.exists(matrix_path) and os.path.exists(records_path)):
+            return
+        records = []
+        with open(records_path, "r") as f:
+            for line in f:
+                # Skip what a crash mid-append left behind
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+        if not records:
+            return
+        dim = records[0]["dim"]
+        stored = os.path.getsize(matrix_path) // (4 * dim)
+        records = [record for record in records if record["row"] < stored]
+        self.documents = [record["document"] for record in records]
+        self.metadatas = [record["metadata"] for record in records]
+        self.ids = [record["id"] for record in records]
+        matrix = np.memmap(matrix_path, dtype=np.float32, mode="r", shape=(stored, dim))
+        rows = [record["row"] for record in records]
+        # Rows orphaned by a crash leave gaps; only then copy the live rows out
+        self.matrix = matrix[: len(rows)] if rows == list(range(len(rows))) else matrix[rows]
+
+    def _append(self, rows, documents, metadatas, ids):
+        """Append new rows, then one record per row naming its row index.
+
+        A record is written only after its row, so a crash in between leaves
+        an orphaned row that _load skips rather than a misaligned matrix.
+        """
+        os.makedirs(self.persist_dir, exist_ok=True)
+        matrix_path, records_path = self._paths()
+        dim = rows.shape[1]
+        row_bytes = 4 * dim
+        with open(records_path, "a+") as records_file:
+            # Held across both files so appends from other processes stay aligned
+            if fcntl is not None:
+                fcntl.flock(records_file, fcntl.LOCK_EX)
+            try:
+                with open(matrix_path, "ab") as matrix_file:
+                    size = matrix_file.seek(0, os.SEEK_END)
+                    if size % row_bytes:  # torn row from a crash
+                        matrix_file.truncate(size - size % row_bytes)
+                    first = size // row_bytes
+                    matrix_file.write(np.ascontiguousarray(rows, dtype=np.float32).tobytes())
+
+                end = records_file.seek(0, os.SEEK_END)
+                if end:
+                    records_file.seek(end - 1)
+                    torn = records_file.read(1) != "\n"
+                    records_file.seek(0, os.SEEK_END)
+                    if torn:
+                        records_file.write("\n")
+                records_file.write(
+                    "".join(
+                        json.dumps(
+                            {
+                                "id": id_,
+                                "row": first + i,
+                                "dim": dim,
+                                "document": document,
+                                "metadata": metadata,
+                            }
+                        )
+                        + "\n"
+                        for i, (id_, document, metadata) in enumerate(
+                            zip(ids, documents, metadatas)
+                        )
+                    )
+                )
+                records_file.flush()
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(records_file, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _normalize(vectors):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        return vectors / np.where(norms == 0, 1, norms)
+
+    def count(self):
+        return len(self.documents)
+
+    def add(self, documents, metadatas, embeddings, ids):
+        new_rows = self._normalize(embeddings)
+        with self._lock:
+            self.matrix = (
+                new_rows
+                if self.matrix is None
+                else np.ascontiguousarray(np.concatenate([self.matrix, new_rows]))
+            )
+            self.documents.extend(documents)
+            self.metadatas.extend(metadatas)
+            self.ids.extend(ids)
+            if self.persist_dir:
+                self._append(new_rows, documents, metadatas, ids)
+
+    def query(self, query_embeddings, n_results=1, include=None):
+        matrix, documents, metadatas = self.matrix, self.documents, self.metadatas
+        results = {"documents": [], "metadatas": [], "distances": []}
+        for query in self._normalize(query_embeddings).reshape(
+            len(query_embeddings), -1
+        ):
+            k = min(n_results, 0 if matrix is None else len(matrix))
+            if k == 0:
+                top = np.empty(0, dtype=np.int64)
+                scores = np.empty(0, dtype=np.float32)
+            else:
+                scores = matrix @ query
+                top = np.argpartition(-scores, k - 1)[:k]
+                top = top[np.argsort(-scores[top], kind="stable")]
+            results["documents"].append([documents[i] for i in top])
+            results["metadatas"].append([metadatas[i] for i in top])
+            results["distances"].append([float(2 - 2 * scores[i]) for i in top])
+        return results
+
 
 class FinancialSituationMemory:
     def __init__(self, name, config):
@@ -10,16 +217,67 @@ class FinancialSituationMemory:
         else:
             self.embedding = "text-embedding-3-small"
         self.client = OpenAI(base_url=config["backend_url"])
-        self.chroma_client = chromadb.Client(Settings(allow_reset=True))
-        self.situation_collection = self.chroma_client.create_collection(name=name)
+        self.name = name
+        self.persist_dir = config.get("memory_persist_dir")
+        self.backend = config.get("memory_backend", "chroma")
+        self._collection = None
+        self._collection_lock = threading.Lock()
+
+    @property
+    def situation_collection(self):
+        """Chroma (or numpy) collection, opened (or created) on first use.
+
+        With memory_persist_dir set, lessons survive across processes and
+        opening a large collection is deferred until it is actually read or
+        written.
+        """
+        if self._collection is None:
+            with self._collection_lock:
+                if self._collection is None:
+                    if self.backend == "numpy":
+                        self._collection = NumpySituationCollection(
+                            self.name, self.persist_dir
+                        )
+                    elif self.backend == "chroma":
+                        self.chroma_client = _get_chroma_client(self.persist_dir)
+                        self._collection = self.chroma_client.get_or_create_collection(
+                            name=self.name
+                        )
+                    else:
+                        raise ValueError(f"Unsupported memory backend: {self.backend}")
+        return self._collection
 
     def get_embedding(self, text):
         """Get OpenAI embedding for a text"""
-        
-        response = self.client.embeddings.create(
-            model=self.embedding, input=text
-        )
-        return response.data[0].embedding
+        return self.get_embeddings([text])[0]
+
+    def get_embeddings(self, texts):
+        """Get OpenAI embeddings for a list of texts, batching the uncached ones"""
+        keys = [_embedding_key(self.embedding, text) for text in texts]
+
+        found = {}
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key in found or key in missing:
+                continue
+            embedding = _EMBEDDING_CACHE.get(key)
+            if embedding is None:
+                missing[key] = text
+            else:
+                found[key] = embedding
+
+        missing_items = list(missing.items())
+        for start in range(0, len(missing_items), EMBEDDING_BATCH_SIZE):
+            batch = missing_items[start : start + EMBEDDING_BATCH_SIZE]
+            response = self.client.embeddings.create(
+                model=self.embedding, input=[text for _, text in batch]
+            )
+            for item in response.data:
+                key = batch[item.index][0]
+                found[key] = item.embedding
+                _EMBEDDING_CACHE.put(key, item.embedding)
+
+        return [found[key] for key in keys]
 
     def add_situations(self, situations_and_advice):
         """Add financial situations and their corresponding advice. Parameter is a list of tuples (situation, rec)"""
@@ -29,13 +287,13 @@ class FinancialSituationMemory:
         ids = []
         embeddings = []
 
-        offset = self.situation_collection.count()
-
-        for i, (situation, recommendation) in enumerate(situations_and_advice):
+        # Random IDs, so processes sharing memory_persist_dir never collide
+        for situation, recommendation in situations_and_advice:
             situations.append(situation)
             advice.append(recommendation)
-            ids.append(str(offset + i))
-            embeddings.append(self.get_embedding(situation))
+            ids.append(str(uuid.uuid4()))
+
+        embeddings = self.get_embeddings(situations)
 
         self.situation_collection.add(
             documents=situations,
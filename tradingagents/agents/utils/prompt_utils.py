@@ -0,0 +1,142 @@
+import os
+import threading
+from typing import Any, Dict, Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+try:
+    import tiktoken
+except ImportError:  # installed with langchain-openai; fall back to an estimate
+    tiktoken = None
+
+# Reports shared by the researcher and risk debater prompts, in the order they are sent
+REPORT_SECTIONS = (
+    ("market_report", "Market Research Report"),
+    ("sentiment_report", "Social Media Sentiment Report"),
+    ("news_report", "Latest World Affairs Report"),
+    ("fundamentals_report", "Company Fundamentals Report"),
+)
+
+# Providers only cache prompt prefixes at least this long (OpenAI, Anthropic)
+MIN_CACHEABLE_TOKENS = 1024
+
+_ENCODING = None
+
+
+def build_report_block(state) -> str:
+    """The analyst reports for this run, identical for every debater that reads them."""
+    sections = "\n\n".join(
+        f"{title}:\n{state.get(key, '')}" for key, title in REPORT_SECTIONS
+    )
+    return (
+        f"Analyst reports for {state['company_of_interest']} "
+        f"as of {state['trade_date']}:\n\n{sections}"
+    )
+
+
+def assemble_prompt(state, instructions: str, context: str = "") -> str:
+    """Report block first, then role instructions, then per-turn context.
+
+    Keeping the reports at the front in one fixed order gives every debater
+    of a run the same prompt prefix, which provider-side prompt caching
+    reuses. Only agents whose prompts already carried the reports use it;
+    the judges and the trader never saw them and still do not.
+    """
+    parts = [build_report_block(state), instructions]
+    if context:
+        parts.append(context)
+    return "\n\n".join(parts)
+
+
+def count_tokens(text: str) -> int:
+    """Token count with the cl100k_base encoding, or a chars/4 estimate without tiktoken."""
+    global _ENCODING
+    if _ENCODING is None:
+        try:
+            _ENCODING = tiktoken.get_encoding("cl100k_base") if tiktoken else False
+        except Exception:
+            # The encoding file is downloaded on first use; offline, estimate
+            _ENCODING = False
+    if _ENCODING is False:
+        return (len(text) + 3) // 4
+    return len(_ENCODING.encode(text, disallowed_special=()))
+
+
+def _message_text(message) -> str:
+    content = message.content if isinstance(message.content, str) else str(message.content)
+    return f"{message.type}: {content}"
+
+
+class PromptCacheTracker(BaseCallbackHandler):
+    """Counts prompt tokens that repeat an earlier prompt's prefix within one run.
+
+    Attach it through the graph config callbacks. Every LLM prompt is compared
+    against the prompts sent before it; the longest shared prefix, if at least
+    min_prefix_tokens long, is what a provider prompt cache could serve.
+    """
+
+    def __init__(self, min_prefix_tokens: int = MIN_CACHEABLE_TOKENS):
+        self.min_prefix_tokens = min_prefix_tokens
+        self._prompts = []
+        self._by_node = {}
+        self._lock = threading.Lock()
+
+    def on_chat_model_start(self, serialized, messages, *, metadata=None, **kwargs):
+        for message_list in messages:
+            self._record(metadata, "\n".join(_message_text(m) for m in message_list))
+
+    def on_llm_start(self, serialized, prompts, *, metadata=None, **kwargs):
+        for prompt in prompts:
+            self._record(metadata, prompt)
+
+    def _record(self, metadata: Optional[Dict[str, Any]], text: str) -> None:
+        node = (metadata or {}).get("langgraph_node", "unknown")
+        tokens = count_tokens(text)
+        with self._lock:
+            shared = max(
+                (len(os.path.commonprefix([text, prev])) for prev in self._prompts),
+                default=0,
+            )
+            self._prompts.append(text)
+        reused = count_tokens(text[:shared]) if shared else 0
+        if reused < self.min_prefix_tokens:
+            reused = 0
+
+        with self._lock:
+            stats = self._by_node.setdefault(
+                node, {"calls": 0, "prompt_tokens": 0, "reused_prefix_tokens": 0}
+            )
+            stats["calls"] += 1
+            stats["prompt_tokens"] += tokens
+            stats["reused_prefix_tokens"] += reused
+
+    def summary(self) -> Dict[str, Any]:
+        """Totals and per-node counts of prompt and reusable prefix tokens."""
+        with self._lock:
+            by_node = {node: dict(stats) for node, stats in self._by_node.items()}
+        prompt_tokens = sum(s["prompt_tokens"] for s in by_node.values())
+        reused = sum(s["reused_prefix_tokens"] for s in by_node.values())
+        return {
+            "calls": sum(s["calls"] for s in by_node.values()),
+            "prompt_tokens": prompt_tokens,
+            "reused_prefix_tokens": reused,
+            "reuse_ratio": reused / prompt_tokens if prompt_tokens else 0.0,
+            "by_node": by_node,
+        }
+
+    def estimate_cost(
+        self, input_price_per_million: float, cached_price_per_million: float
+    ) -> Dict[str, float]:
+        """Prompt cost with and without cache hits on every reusable prefix."""
+        summary = self.summary()
+        fresh = summary["prompt_tokens"] - summary["reused_prefix_tokens"]
+        without_cache = summary["prompt_tokens"] * input_price_per_million / 1e6
+        with_cache = (
+            fresh * input_price_per_million
+            + summary["reused_prefix_tokens"] * cached_price_per_million
+        ) / 1e6
+        return {
+            "cost_without_cache": without_cache,
+            "cost_with_cache": with_cache,
+            "savings": without_cache - with_cache,
+        }
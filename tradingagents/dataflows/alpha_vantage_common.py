@@ -1,12 +1,40 @@
 import os
+import threading
 import requests
 import pandas as pd
 import json
 from datetime import datetime
 from io import StringIO
 
+from .config import get_config
+from .rate_limiter import TokenBucketLimiter
+from .vendor_log import logger
+
 API_BASE_URL = "https://www.alphavantage.co/query"
 
+# Request quotas per entitlement tier, as (requests, period in seconds)
+RATE_LIMIT_TIERS = {
+    "free": [(5, 60), (25, 86400)],
+    "premium_75": [(75, 60)],
+    "premium_150": [(150, 60)],
+    "premium_300": [(300, 60)],
+    "premium_600": [(600, 60)],
+    "premium_1200": [(1200, 60)],
+}
+
+# Used for any setting missing from config["alpha_vantage_rate_limit"]; off
+# unless enabled, since the right quota depends on the account's tier
+DEFAULT_RATE_LIMIT_CONFIG = {
+    "enabled": False,
+    "tier": "free",
+    "limits": None,  # Explicit [(requests, seconds), ...], overrides tier
+    "max_wait": 60,  # Longer waits raise AlphaVantageRateLimitError instead
+    "state_path": None,  # File shared by processes; None keeps the bucket per-process
+}
+
+_LIMITERS = {}
+_LIMITERS_LOCK = threading.Lock()
+
 def get_api_key() -> str:
     """Retrieve the API key for Alpha Vantage from environment variables."""
     api_key = os.getenv("ALPHA_VANTAGE_API_KEY")
@@ -39,6 +67,26 @@ class AlphaVantageRateLimitError(Exception):
     """Exception raised when Alpha Vantage API rate limit is exceeded."""
     pass
 
+def get_rate_limiter():
+    """(limiter, settings) for the configured tier; limiter is None when rate limiting is off."""
+    settings = {**DEFAULT_RATE_LIMIT_CONFIG, **get_config().get("alpha_vantage_rate_limit", {})}
+    if not settings["enabled"]:
+        return None, settings
+
+    limits = settings["limits"] or RATE_LIMIT_TIERS[settings["tier"]]
+    key = (tuple(tuple(limit) for limit in limits), settings["state_path"])
+    with _LIMITERS_LOCK:
+        limiter = _LIMITERS.get(key)
+        if limiter is None:
+            limiter = _LIMITERS[key] = TokenBucketLimiter(limits, settings["state_path"])
+            logger.info(
+                "Alpha Vantage rate limit: %s (%s)%s",
+                "custom limits" if settings["limits"] else f"tier '{settings['tier']}'",
+                ", ".join(f"{requests:g}/{period:g}s" for requests, period in limiter.limits),
+                f", shared via {settings['state_path']}" if settings["state_path"] else "",
+            )
+    return limiter, settings
+
 def _make_api_request(function_name: str, params: dict) -> dict | str:
     """Helper function to make API requests and handle responses.
     
@@ -63,6 +111,13 @@ def _make_api_request(function_name: str, params: dict) -> dict | str:
         # Remove entitlement if it's None or empty
         api_params.pop("entitlement", None)
     
+    # Wait for quota client-side rather than spending a call on a rejection
+    limiter, settings = get_rate_limiter()
+    if limiter is not None and limiter.acquire(settings["max_wait"]) is None:
+        raise AlphaVantageRateLimitError(
+            f"Alpha Vantage {settings['tier']} quota would need a wait over {settings['max_wait']}s"
+        )
+
     response = requests.get(API_BASE_URL, params=api_params)
     response.raise_for_status()
 
@@ -75,6 +130,9 @@ def _make_api_request(function_name: str, params: dict) -> dict | str:
         if "Information" in response_json:
             info_message = response_json["Information"]
             if "rate limit" in info_message.lower() or "api key" in info_message.lower():
+                if limiter is not None:
+                    # Quota used up elsewhere (another key user); make later calls wait
+                    limiter.drain()
                 raise AlphaVantageRateLimitError(f"Alpha Vantage rate limit exceeded: {info_message}")
     except json.JSONDecodeError:
         # Response is not JSON (likely CSV data), which is normal
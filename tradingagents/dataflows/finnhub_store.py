@@ -0,0 +1,136 @@
+import json
+import os
+import sqlite3
+import threading
+from bisect import bisect_left, bisect_right
+from contextlib import closing
+from typing import Annotated, Dict, List
+
+from .config import get_config
+from .utils import LRUCache
+
+# Recently used {ticker}_data_formatted.json files kept decoded in memory
+_TICKER_CACHE = LRUCache(maxsize=256)
+_BUILD_LOCK = threading.Lock()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (
+    path TEXT PRIMARY KEY,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    path TEXT NOT NULL,
+    date TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (path, date)
+) WITHOUT ROWID;
+"""
+
+
+def _index_path() -> str:
+    return os.path.join(get_config()["data_cache_dir"], "finnhub_index.sqlite")
+
+
+def _connect() -> sqlite3.Connection:
+    index_path = _index_path()
+    os.makedirs(os.path.dirname(index_path), exist_ok=True)
+    conn = sqlite3.connect(index_path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def _ensure_indexed(conn: sqlite3.Connection, data_path: str) -> None:
+    """(Re)build the rows for data_path if the JSON file changed since indexing."""
+    stat = os.stat(data_path)
+    row = conn.execute(
+        "SELECT mtime, size FROM sources WHERE path = ?", (data_path,)
+    ).fetchone()
+    if row is not None and row[0] == stat.st_mtime and row[1] == stat.st_size:
+        return
+
+    with open(data_path, "r") as f:
+        data = json.load(f)
+
+    # Only dates with data are indexed, matching the old len(value) > 0 filter
+    rows = [
+        (data_path, key, json.dumps(value))
+        for key, value in data.items()
+        if len(value) > 0
+    ]
+    with conn:
+        conn.execute("DELETE FROM entries WHERE path = ?", (data_path,))
+        conn.executemany(
+            "INSERT OR REPLACE INTO entries (path, date, payload) VALUES (?, ?, ?)",
+            rows,
+        )
+        conn.execute(
+            "INSERT OR REPLACE INTO sources (path, mtime, size) VALUES (?, ?, ?)",
+            (data_path, stat.st_mtime, stat.st_size),
+        )
+
+
+class _TickerIndex:
+    """Sorted date keys for one Finnhub file; payloads are decoded on demand."""
+
+    def __init__(self, data_path: str, source_mtime: float, dates: List[str]):
+        self.data_path = data_path
+        self.source_mtime = source_mtime
+        self.dates = dates
+        self._payloads = {}
+        self._lock = threading.Lock()
+
+    def range(self, start_date: str, end_date: str) -> Dict[str, list]:
+        lo = bisect_left(self.dates, start_date)
+        hi = bisect_right(self.dates, end_date)
+        wanted = self.dates[lo:hi]
+        if not wanted:
+            return {}
+
+        with self._lock:
+            missing = [d for d in wanted if d not in self._payloads]
+            if missing:
+                with closing(_connect()) as conn:
+                    for date, payload in conn.execute(
+                        "SELECT date, payload FROM entries "
+                        "WHERE path = ? AND date BETWEEN ? AND ?",
+                        (self.data_path, missing[0], missing[-1]),
+                    ):
+                        self._payloads[date] = json.loads(payload)
+            return {d: self._payloads[d] for d in wanted}
+
+
+def _load_ticker_index(data_path: str) -> _TickerIndex:
+    source_mtime = os.path.getmtime(data_path)
+    index = _TICKER_CACHE.get(data_path)
+    if index is not None and index.source_mtime == source_mtime:
+        return index
+
+    with _BUILD_LOCK:
+        with closing(_connect()) as conn:
+            _ensure_indexed(conn, data_path)
+            dates = [
+                row[0]
+                for row in conn.execute(
+                    "SELECT date FROM entries WHERE path = ? ORDER BY date",
+                    (data_path,),
+                )
+            ]
+    index = _TickerIndex(data_path, source_mtime, dates)
+    _TICKER_CACHE.put(data_path, index)
+    return index
+
+
+def get_indexed_range(
+    data_path: Annotated[str, "path to a finnhub {ticker}_data_formatted.json file"],
+    start_date: Annotated[str, "Start date in yyyy-mm-dd format"],
+    end_date: Annotated[str, "End date in yyyy-mm-dd format"],
+) -> Dict[str, list]:
+    """Non-empty entries of data_path dated start_date..end_date, in date order."""
+    return _load_ticker_index(data_path).range(start_date, end_date)
+
+
+def clear_finnhub_cache() -> None:
+    """Drop the in-process ticker cache (the SQLite index is kept)."""
+    _TICKER_CACHE.clear()
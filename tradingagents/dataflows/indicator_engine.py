@@ -0,0 +1,143 @@
+import os
+import threading
+from typing import Annotated
+
+import numpy as np
+import pandas as pd
+from stockstats import wrap
+
+from .config import get_config
+from .ohlcv_cache import refresh_series
+from .utils import LRUCache
+
+# Indicators offered to the market analyst; all are computed together the
+# first time a symbol is requested.
+SUPPORTED_INDICATORS = (
+    "close_50_sma",
+    "close_200_sma",
+    "close_10_ema",
+    "macd",
+    "macds",
+    "macdh",
+    "rsi",
+    "boll",
+    "boll_ub",
+    "boll_lb",
+    "atr",
+    "vwma",
+    "mfi",
+)
+
+# (symbol, data_version) -> _IndicatorSet
+_RESULT_CACHE = LRUCache(maxsize=64)
+_LOCKS_GUARD = threading.Lock()
+_SYMBOL_LOCKS = {}
+
+
+class _IndicatorSet:
+    """Stockstats frame for one symbol plus its formatted indicator columns."""
+
+    def __init__(self, stats_df):
+        self.stats_df = stats_df
+        self.dates = pd.Index(stats_df["Date"].to_numpy())
+        self.formatted = {}
+        self.lock = threading.Lock()
+
+    def compute(self, indicators, strict: bool = True) -> None:
+        for indicator in indicators:
+            if indicator in self.formatted:
+                continue
+            # Accessing the column triggers stockstats to calculate it for all rows
+            try:
+                values = self.stats_df[indicator]
+            except Exception:
+                if strict:
+                    raise
+                # e.g. volume-based indicators on data without volume; the
+                # error resurfaces if this indicator is actually requested
+                continue
+            formatted = pd.Series(
+                np.where(values.isna(), "N/A", values.to_numpy().astype(str)),
+                index=self.dates,
+            )
+            # Later rows win for duplicate dates
+            self.formatted[indicator] = formatted[
+                ~formatted.index.duplicated(keep="last")
+            ]
+
+    def get(self, indicator: str) -> pd.Series:
+        if indicator not in self.formatted:
+            with self.lock:
+                self.compute([indicator])
+        return self.formatted[indicator]
+
+
+def _symbol_lock(symbol: str) -> threading.Lock:
+    with _LOCKS_GUARD:
+        return _SYMBOL_LOCKS.setdefault(symbol, threading.Lock())
+
+
+def _ohlcv_cache_file(symbol: str, config) -> str:
+    """Path of the cached OHLCV CSV, fetching any missing bars first (online mode)."""
+    online = config["data_vendors"]["technical_indicators"] != "local"
+
+    if not online:
+        data_file = os.path.join(
+            config.get("data_cache_dir", "data"),
+            f"{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
+        )
+        if not os.path.exists(data_file):
+            raise Exception("Stockstats fail: Yahoo Finance data not fetched yet!")
+        return data_file
+
+    # One growing series per symbol, refreshed incrementally
+    return refresh_series(symbol)
+
+
+def _load_stats_frame(data_file: str, online: bool):
+    data = pd.read_csv(data_file)
+    if not online:
+        return wrap(data)
+
+    data["Date"] = pd.to_datetime(data["Date"])
+    df = wrap(data)
+    df["Date"] = df["Date"].dt.strftime("%Y-%m-%d")
+    return df
+
+
+def get_indicator_set(
+    symbol: Annotated[str, "ticker symbol of the company"],
+) -> _IndicatorSet:
+    """Return the computed indicator set for symbol, building it on a cache miss.
+
+    Results are keyed by (symbol, data_version), where the version is the
+    cached CSV path and modification time, so a refreshed price file yields a
+    fresh computation while repeat calls are pure lookups.
+    """
+    config = get_config()
+    online = config["data_vendors"]["technical_indicators"] != "local"
+
+    with _symbol_lock(symbol):
+        data_file = _ohlcv_cache_file(symbol, config)
+        data_version = (data_file, os.path.getmtime(data_file))
+        key = (symbol, data_version)
+
+        indicator_set = _RESULT_CACHE.get(key)
+        if indicator_set is None:
+            indicator_set = _IndicatorSet(_load_stats_frame(data_file, online))
+            indicator_set.compute(SUPPORTED_INDICATORS, strict=False)
+            _RESULT_CACHE.put(key, indicator_set)
+
+    return indicator_set
+
+
+def get_indicator_values(
+    symbol: Annotated[str, "ticker symbol of the company"],
+    indicator: Annotated[str, "technical indicator to calculate"],
+) -> pd.Series:
+    """Formatted indicator values for every available date, indexed by yyyy-mm-dd."""
+    return get_indicator_set(symbol).get(indicator)
+
+
+def clear_indicator_cache() -> None:
+    _RESULT_CACHE.clear()
@@ -1,3 +1,7 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
 from typing import Annotated
 
 # Import from vendor-specific modules
@@ -16,6 +20,14 @@ from .alpha_vantage import (
     get_news as get_alpha_vantage_news
 )
 from .alpha_vantage_common import AlphaVantageRateLimitError
+from .tool_cache import (
+    is_tool_cache_enabled,
+    make_cache_key,
+    get_cached_result,
+    put_cached_result,
+)
+from .vendor_health import is_vendor_available, is_vendor_open, record_vendor_call
+from .vendor_log import log_route, log_vendor_call
 
 # Configuration and routing logic
 from .config import get_config
@@ -138,10 +150,210 @@ def get_vendor(category: str, method: str = None) -> str:
     # Fall back to category-level configuration
     return config.get("data_vendors", {}).get(category, "default")
 
+_VENDOR_POOL = None
+_VENDOR_POOL_WORKERS = None
+_VENDOR_POOL_LOCK = threading.Lock()
+
+# (vendor, impl name) of timed-out calls whose worker thread is still busy
+_STUCK_CALLS = set()
+_STUCK_CALLS_LOCK = threading.Lock()
+
+
+def _get_vendor_pool(max_workers: int) -> ThreadPoolExecutor:
+    """Shared pool for concurrent vendor calls, rebuilt when max_workers changes.
+
+    The replaced pool is shut down without waiting; calls already running on
+    it finish in the background.
+    """
+    global _VENDOR_POOL, _VENDOR_POOL_WORKERS
+    with _VENDOR_POOL_LOCK:
+        if _VENDOR_POOL is None or _VENDOR_POOL_WORKERS != max_workers:
+            if _VENDOR_POOL is not None:
+                _VENDOR_POOL.shutdown(wait=False)
+            _VENDOR_POOL = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="vendor"
+            )
+            _VENDOR_POOL_WORKERS = max_workers
+        return _VENDOR_POOL
+
+
+def _mark_stuck(key, future) -> None:
+    """Remember a timed-out call until its worker thread actually returns."""
+    with _STUCK_CALLS_LOCK:
+        _STUCK_CALLS.add(key)
+
+    def release(_):
+        with _STUCK_CALLS_LOCK:
+            _STUCK_CALLS.discard(key)
+
+    future.add_done_callback(release)
+
+
+def _is_stuck(key) -> bool:
+    with _STUCK_CALLS_LOCK:
+        return key in _STUCK_CALLS
+
+
+def _claim(recorded) -> bool:
+    """Whether this side records the call's outcome (always, without a shared lock)."""
+    return recorded is None or recorded.acquire(blocking=False)
+
+
+def _get_vendor_timeout(vendor: str, config) -> float:
+    """Per-vendor timeout in seconds, falling back to the global one (None = wait)."""
+    return config.get("vendor_timeouts", {}).get(vendor, config.get("vendor_timeout"))
+
+
+def _call_vendor_impl(
+    method: str, impl_func, vendor_name: str, args, kwargs, attempt=None, recorded=None
+):
+    """Call one vendor implementation and return (succeeded, result).
+
+    When the tool cache is enabled, a cached result for the same method,
+    vendor, implementation and arguments is returned without calling it.
+    recorded is a lock shared with whoever waits on this call: only the side
+    that acquires it first feeds the outcome into the vendor health, so a
+    call already reported as timed out is not counted again when it ends.
+    """
+    impl_name = impl_func.__name__
+    started = time.perf_counter()
+    cache_key = None
+    if is_tool_cache_enabled():
+        cache_key = make_cache_key(method, vendor_name, impl_name, args, kwargs)
+        cached = get_cached_result(cache_key)
+        if cached is not None:
+            log_vendor_call(method, vendor_name, impl_name, attempt, started, "cache_hit", cached)
+            return True, cached
+
+    try:
+        result = impl_func(*args, **kwargs)
+        if _claim(recorded):
+            record_vendor_call(vendor_name, impl_name, True, time.perf_counter() - started)
+        log_vendor_call(method, vendor_name, impl_name, attempt, started, "success", result)
+        if cache_key is not None:
+            put_cached_result(
+                cache_key,
+                method,
+                get_category_for_method(method),
+                vendor_name,
+                args,
+                kwargs,
+                result,
+            )
+        return True, result
+    except AlphaVantageRateLimitError as e:
+        # Continue to next vendor for fallback
+        if _claim(recorded):
+            record_vendor_call(
+                vendor_name,
+                impl_name,
+                False,
+                time.perf_counter() - started,
+                rate_limited=True,
+                error=e,
+            )
+        log_vendor_call(method, vendor_name, impl_name, attempt, started, "rate_limited", error=e)
+        return False, None
+    except Exception as e:
+        # Log error but continue with other implementations
+        if _claim(recorded):
+            record_vendor_call(
+                vendor_name, impl_name, False, time.perf_counter() - started, error=e
+            )
+        log_vendor_call(method, vendor_name, impl_name, attempt, started, "error", error=e)
+        return False, None
+
+
+def _run_vendor_impls(method: str, vendor_methods, args, kwargs, concurrent: bool = False, attempt=None):
+    """Run (impl, vendor) pairs and return their (succeeded, result) outcomes in input order.
+
+    In concurrent mode all implementations are submitted to the shared pool at
+    once, so the wall-clock time is that of the slowest one. A call that runs
+    past its vendor's timeout is reported as failed and left to finish in the
+    background: a running thread cannot be cancelled, so it keeps its pool
+    worker until the vendor returns. To keep hung vendors from filling the
+    pool, an implementation is not submitted again while such a call of it is
+    still running; it is reported as failed instead.
+    """
+    if not concurrent:
+        return [
+            _call_vendor_impl(method, impl_func, vendor_name, args, kwargs, attempt)
+            for impl_func, vendor_name in vendor_methods
+        ]
+
+    config = get_config()
+    pool = _get_vendor_pool(config.get("vendor_max_workers", 8))
+    submitted_at = time.monotonic()
+    started = time.perf_counter()
+    futures = []
+    tokens = [threading.Lock() for _ in vendor_methods]
+    for (impl_func, vendor_name), recorded in zip(vendor_methods, tokens):
+        if _is_stuck((vendor_name, impl_func.__name__)):
+            log_route(
+                method,
+                logging.INFO,
+                f"skipping {vendor_name}.{impl_func.__name__}, an earlier timed-out call is still running",
+                vendor=vendor_name,
+                impl=impl_func.__name__,
+            )
+            futures.append(None)
+            continue
+        futures.append(
+            pool.submit(
+                _call_vendor_impl,
+                method,
+                impl_func,
+                vendor_name,
+                args,
+                kwargs,
+                attempt,
+                recorded,
+            )
+        )
+
+    outcomes = []
+    for (impl_func, vendor_name), future, recorded in zip(vendor_methods, futures, tokens):
+        if future is None:
+            outcomes.append((False, None))
+            continue
+        timeout = _get_vendor_timeout(vendor_name, config)
+        remaining = (
+            None if timeout is None else max(0.0, submitted_at + timeout - time.monotonic())
+        )
+        try:
+            outcomes.append(future.result(timeout=remaining))
+        except FuturesTimeoutError:
+            if not future.cancel():
+                _mark_stuck((vendor_name, impl_func.__name__), future)
+            error = TimeoutError(f"exceeded {timeout}s")
+            if _claim(recorded):
+                record_vendor_call(
+                    vendor_name,
+                    impl_func.__name__,
+                    False,
+                    time.perf_counter() - started,
+                    error=error,
+                )
+            log_vendor_call(
+                method, vendor_name, impl_func.__name__, attempt, started, "timeout", error=error
+            )
+            outcomes.append((False, None))
+    return outcomes
+
+
+def _get_vendor_methods(vendor_impl, vendor: str):
+    """Normalize a VENDOR_METHODS entry to a list of (impl, vendor) pairs."""
+    if isinstance(vendor_impl, list):
+        return [(impl, vendor) for impl in vendor_impl]
+    return [(vendor_impl, vendor)]
+
+
 def route_to_vendor(method: str, *args, **kwargs):
     """Route method calls to appropriate vendor implementation with fallback support."""
+    route_started = time.perf_counter()
     category = get_category_for_method(method)
     vendor_config = get_vendor(category, method)
+    concurrent = get_config().get("concurrent_vendors", False)
 
     # Handle comma-separated vendors
     primary_vendors = [v.strip() for v in vendor_config.split(',')]
@@ -158,10 +370,56 @@ def route_to_vendor(method: str, *args, **kwargs):
         if vendor not in fallback_vendors:
             fallback_vendors.append(vendor)
 
-    # Debug: Print fallback ordering
-    primary_str = " → ".join(primary_vendors)
-    fallback_str = " → ".join(fallback_vendors)
-    print(f"DEBUG: {method} - Primary: [{primary_str}] | Full fallback order: [{fallback_str}]")
+    log_route(
+        method,
+        logging.DEBUG,
+        f"primary [{' → '.join(primary_vendors)}], fallback order [{' → '.join(fallback_vendors)}]",
+        primary=primary_vendors,
+        fallback_order=fallback_vendors,
+    )
+
+    # Implementations whose circuit is open are skipped, unless all of them are
+    supported_vendors = [v for v in fallback_vendors if v in VENDOR_METHODS[method]]
+    use_circuit_breaker = not all(
+        is_vendor_open(vendor, impl_func.__name__)
+        for vendor in supported_vendors
+        for impl_func, _ in _get_vendor_methods(VENDOR_METHODS[method][vendor], vendor)
+    )
+
+    def circuit_allows(vendor_methods):
+        """The (impl, vendor) pairs whose circuit lets a call through now."""
+        if not use_circuit_breaker:
+            return vendor_methods
+        allowed = []
+        for impl_func, vendor in vendor_methods:
+            if is_vendor_available(vendor, impl_func.__name__):
+                allowed.append((impl_func, vendor))
+            else:
+                log_route(
+                    method,
+                    logging.INFO,
+                    f"skipping {vendor}.{impl_func.__name__}, circuit open",
+                    vendor=vendor,
+                    impl=impl_func.__name__,
+                )
+        return allowed
+
+    # Multi-vendor configs query every vendor anyway, so in concurrent mode
+    # start all of them up front and only collect the outcomes in the loop
+    precomputed = None
+    if concurrent and len(primary_vendors) > 1:
+        all_methods = [
+            pair
+            for vendor in supported_vendors
+            for pair in circuit_allows(
+                _get_vendor_methods(VENDOR_METHODS[method][vendor], vendor)
+            )
+        ]
+        precomputed = {}
+        for (_, vendor), outcome in zip(
+            all_methods, _run_vendor_impls(method, all_methods, args, kwargs, concurrent=True)
+        ):
+            precomputed.setdefault(vendor, []).append(outcome)
 
     # Track results and execution state
     results = []
@@ -172,10 +430,23 @@ def route_to_vendor(method: str, *args, **kwargs):
     for vendor in fallback_vendors:
         if vendor not in VENDOR_METHODS[method]:
             if vendor in primary_vendors:
-                print(f"INFO: Vendor '{vendor}' not supported for method '{method}', falling back to next vendor")
+                log_route(
+                    method,
+                    logging.INFO,
+                    f"vendor '{vendor}' not supported, falling back",
+                    vendor=vendor,
+                )
             continue
+        if precomputed is not None:
+            if vendor not in precomputed:
+                continue
+        else:
+            vendor_methods = circuit_allows(
+                _get_vendor_methods(VENDOR_METHODS[method][vendor], vendor)
+            )
+            if not vendor_methods:
+                continue
 
-        vendor_impl = VENDOR_METHODS[method][vendor]
         is_primary_vendor = vendor in primary_vendors
         vendor_attempt_count += 1
 
@@ -183,62 +454,51 @@ def route_to_vendor(method: str, *args, **kwargs):
         if is_primary_vendor:
             any_primary_vendor_attempted = True
 
-        # Debug: Print current attempt
-        vendor_type = "PRIMARY" if is_primary_vendor else "FALLBACK"
-        print(f"DEBUG: Attempting {vendor_type} vendor '{vendor}' for {method} (attempt #{vendor_attempt_count})")
-
-        # Handle list of methods for a vendor
-        if isinstance(vendor_impl, list):
-            vendor_methods = [(impl, vendor) for impl in vendor_impl]
-            print(f"DEBUG: Vendor '{vendor}' has multiple implementations: {len(vendor_methods)} functions")
-        else:
-            vendor_methods = [(vendor_impl, vendor)]
-
         # Run methods for this vendor
-        vendor_results = []
-        for impl_func, vendor_name in vendor_methods:
-            try:
-                print(f"DEBUG: Calling {impl_func.__name__} from vendor '{vendor_name}'...")
-                result = impl_func(*args, **kwargs)
-                vendor_results.append(result)
-                print(f"SUCCESS: {impl_func.__name__} from vendor '{vendor_name}' completed successfully")
-                    
-            except AlphaVantageRateLimitError as e:
-                if vendor == "alpha_vantage":
-                    print(f"RATE_LIMIT: Alpha Vantage rate limit exceeded, falling back to next available vendor")
-                    print(f"DEBUG: Rate limit details: {e}")
-                # Continue to next vendor for fallback
-                continue
-            except Exception as e:
-                # Log error but continue with other implementations
-                print(f"FAILED: {impl_func.__name__} from vendor '{vendor_name}' failed: {e}")
-                continue
+        if precomputed is not None:
+            outcomes = precomputed[vendor]
+        else:
+            outcomes = _run_vendor_impls(
+                method, vendor_methods, args, kwargs, concurrent, vendor_attempt_count
+            )
+        vendor_results = [result for succeeded, result in outcomes if succeeded]
 
         # Add this vendor's results
         if vendor_results:
             results.extend(vendor_results)
             successful_vendor = vendor
-            result_summary = f"Got {len(vendor_results)} result(s)"
-            print(f"SUCCESS: Vendor '{vendor}' succeeded - {result_summary}")
-            
+
             # Stopping logic: Stop after first successful vendor for single-vendor configs
             # Multiple vendor configs (comma-separated) may want to collect from multiple sources
             if len(primary_vendors) == 1:
-                print(f"DEBUG: Stopping after successful vendor '{vendor}' (single-vendor config)")
                 break
-        else:
-            print(f"FAILED: Vendor '{vendor}' produced no results")
 
     # Final result summary
     if not results:
-        print(f"FAILURE: All {vendor_attempt_count} vendor attempts failed for method '{method}'")
+        log_route(
+            method,
+            logging.ERROR,
+            f"all {vendor_attempt_count} vendor attempts failed",
+            attempts=vendor_attempt_count,
+            outcome="failed",
+            duration=time.perf_counter() - route_started,
+        )
         raise RuntimeError(f"All vendor implementations failed for method '{method}'")
-    else:
-        print(f"FINAL: Method '{method}' completed with {len(results)} result(s) from {vendor_attempt_count} vendor attempt(s)")
+
+    log_route(
+        method,
+        logging.INFO,
+        f"{len(results)} result(s) from {vendor_attempt_count} vendor attempt(s), last from '{successful_vendor}'",
+        attempts=vendor_attempt_count,
+        results=len(results),
+        vendor=successful_vendor,
+        outcome="success",
+        duration=time.perf_counter() - route_started,
+    )
 
     # Return single result if only one, otherwise concatenate as string
     if len(results) == 1:
         return results[0]
     else:
         # Convert all results to strings and concatenate
-        return '\n'.join(str(result) for result in results)
\ No newline at end of file
+        return '\n'.join(str(result) for result in results)
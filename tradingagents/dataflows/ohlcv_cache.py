@@ -0,0 +1,296 @@
+import json
+import os
+import re
+import threading
+import time
+from typing import Annotated, Optional
+
+import pandas as pd
+import yfinance as yf
+
+from .config import get_config
+from .tool_cache import get_freshness_settings
+from .utils import LRUCache
+
+# How much history a fresh series starts with
+HISTORY_YEARS = 15
+
+# Relative change in the last cached close that means the adjusted history
+# was restated (split/dividend) and the series must be re-downloaded
+RESTATEMENT_TOLERANCE = 1e-4
+
+# Column order of yf.Ticker.history(), used when serving prefetched bars
+HISTORY_COLUMNS = ["Open", "High", "Low", "Close", "Volume", "Dividends", "Stock Splits"]
+
+# Columns kept in the on-disk series
+SERIES_COLUMNS = ["Close", "High", "Low", "Open", "Volume"]
+
+_LOCKS_GUARD = threading.Lock()
+_SYMBOL_LOCKS = {}
+
+# symbol -> (frame, covered_start, covered_end, fetched_at) filled by prefetch_ohlcv
+_PREFETCHED = LRUCache(maxsize=2048)
+
+
+def _symbol_lock(symbol: str) -> threading.Lock:
+    with _LOCKS_GUARD:
+        return _SYMBOL_LOCKS.setdefault(symbol, threading.Lock())
+
+
+def get_series_path(
+    symbol: Annotated[str, "ticker symbol of the company"],
+    cache_dir: Optional[str] = None,
+) -> str:
+    """Path of the single growing OHLCV series kept for symbol (case-insensitive)."""
+    cache_dir = cache_dir or get_config()["data_cache_dir"]
+    return os.path.join(cache_dir, f"{symbol.upper()}-YFin-data.csv")
+
+
+def _meta_path(series_path: str) -> str:
+    return series_path[: -len(".csv")] + ".meta.json"
+
+
+def _read_meta(series_path: str) -> dict:
+    try:
+        with open(_meta_path(series_path), "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _write_meta(series_path: str, meta: dict) -> None:
+    tmp_path = _meta_path(series_path) + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, _meta_path(series_path))
+
+
+def _read_header_and_last_row(series_path: str):
+    with open(series_path, "rb") as f:
+        header = f.readline().decode().strip().split(",")
+        f.seek(0, os.SEEK_END)
+        f.seek(max(0, f.tell() - 4096))
+        lines = [line for line in f.read().decode().splitlines() if line.strip()]
+    last_row = lines[-1].split(",") if len(lines) > 0 else None
+    if last_row == header:
+        last_row = None
+    return header, last_row
+
+
+def _download(symbol: str, start_date: str, end_date: str) -> pd.DataFrame:
+    data = yf.download(
+        symbol,
+        start=start_date,
+        end=end_date,
+        multi_level_index=False,
+        progress=False,
+        auto_adjust=True,
+    )
+    return data.reset_index()
+
+
+def _write_atomic(series_path: str, data: pd.DataFrame, append: bool) -> None:
+    """Write the full series, or append rows, via a temp file and os.replace."""
+    tmp_path = series_path + ".tmp"
+    if append:
+        with open(series_path, "rb") as src, open(tmp_path, "wb") as dst:
+            dst.write(src.read())
+        data.to_csv(tmp_path, mode="a", header=False, index=False)
+    else:
+        data.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, series_path)
+
+
+def _remove_dated_snapshots(symbol: str, cache_dir: str) -> None:
+    """Delete the old per-day {symbol}-YFin-data-{start}-{end}.csv snapshots."""
+    pattern = re.compile(
+        re.escape(symbol) + r"-YFin-data-\d{4}-\d{2}-\d{2}-\d{4}-\d{2}-\d{2}\.csv$"
+    )
+    for file_name in os.listdir(cache_dir):
+        # The bundled local dataset shares the naming scheme; keep it
+        if file_name.endswith("-2015-01-01-2025-03-25.csv"):
+            continue
+        if pattern.match(file_name):
+            try:
+                os.remove(os.path.join(cache_dir, file_name))
+            except OSError:
+                pass
+
+
+def refresh_series(
+    symbol: Annotated[str, "ticker symbol of the company"],
+    today: Optional[str] = None,
+) -> str:
+    """Bring the cached series for symbol up to date and return its path.
+
+    Only bars after the last cached date are downloaded, at most once per
+    calendar day. If the overlapping bar no longer matches (adjusted prices
+    were restated after a split or dividend) the series is re-downloaded.
+    """
+    config = get_config()
+    cache_dir = config["data_cache_dir"]
+    os.makedirs(cache_dir, exist_ok=True)
+
+    # Same key as prefetch_ohlcv, whatever case the tools pass
+    symbol = symbol.upper()
+    today_ts = pd.Timestamp(today) if today else pd.Timestamp.today().normalize()
+    today_str = today_ts.strftime("%Y-%m-%d")
+    series_path = get_series_path(symbol, cache_dir)
+
+    with _symbol_lock(symbol):
+        meta = _read_meta(series_path)
+        if os.path.exists(series_path) and meta.get("last_refresh") == today_str:
+            return series_path
+
+        header, last_row = (
+            _read_header_and_last_row(series_path)
+            if os.path.exists(series_path)
+            else (None, None)
+        )
+
+        if last_row is None:
+            start_str = (today_ts - pd.DateOffset(years=HISTORY_YEARS)).strftime(
+                "%Y-%m-%d"
+            )
+            data = _download(symbol, start_str, today_str)
+            if data.empty:
+                raise Exception(f"Yahoo Finance returned no data for {symbol}")
+            _write_atomic(series_path, data, append=False)
+        else:
+            last_date = last_row[0][:10]
+            if last_date < today_str:
+                # Re-fetch the last cached bar too, to detect restated history
+                new_data = _download(symbol, last_date, today_str)
+                if new_data.empty:
+                    # Not even the overlapping bar came back: the fetch failed,
+                    # so keep the cached series and retry on the next call
+                    return series_path
+                new_data["Date"] = pd.to_datetime(new_data["Date"])
+                overlap = new_data[new_data["Date"].dt.strftime("%Y-%m-%d") == last_date]
+
+                cached_close = float(last_row[header.index("Close")])
+                if not overlap.empty and abs(
+                    float(overlap["Close"].iloc[0]) - cached_close
+                ) > RESTATEMENT_TOLERANCE * max(abs(cached_close), 1.0):
+                    start_str = (
+                        today_ts - pd.DateOffset(years=HISTORY_YEARS)
+                    ).strftime("%Y-%m-%d")
+                    data = _download(symbol, start_str, today_str)
+                    if not data.empty:
+                        _write_atomic(series_path, data, append=False)
+                else:
+                    appended = new_data[
+                        new_data["Date"].dt.strftime("%Y-%m-%d") > last_date
+                    ]
+                    if not appended.empty:
+                        appended = appended.reindex(columns=header)
+                        _write_atomic(series_path, appended, append=True)
+
+        meta["last_refresh"] = today_str
+        _write_meta(series_path, meta)
+        _remove_dated_snapshots(symbol, cache_dir)
+
+    return series_path
+
+
+def prefetch_ohlcv(
+    symbols: Annotated[list, "ticker symbols to download"],
+    today: Optional[str] = None,
+) -> list:
+    """Download the full history of a whole universe in one batched request.
+
+    Each symbol's cached series is rewritten (and marked refreshed for today)
+    and its bars are kept in memory, so get_stock_data calls inside the
+    covered range need no network round trip. Returns the symbols that came
+    back with data.
+    """
+    config = get_config()
+    cache_dir = config["data_cache_dir"]
+    os.makedirs(cache_dir, exist_ok=True)
+
+    symbols = list(dict.fromkeys(s.upper() for s in symbols))
+    if not symbols:
+        return []
+
+    today_ts = pd.Timestamp(today) if today else pd.Timestamp.today().normalize()
+    today_str = today_ts.strftime("%Y-%m-%d")
+    start_str = (today_ts - pd.DateOffset(years=HISTORY_YEARS)).strftime("%Y-%m-%d")
+
+    data = yf.download(
+        symbols,
+        start=start_str,
+        end=today_str,
+        group_by="ticker",
+        multi_level_index=True,
+        auto_adjust=True,
+        actions=True,
+        progress=False,
+        threads=True,
+    )
+
+    fetched = []
+    for symbol in symbols:
+        if data.empty or symbol not in data.columns.get_level_values(0):
+            continue
+        frame = data[symbol].dropna(how="all")
+        if frame.empty:
+            continue
+        frame.index.name = "Date"
+        frame.columns.name = None
+
+        _PREFETCHED.put(
+            symbol,
+            (
+                frame[[c for c in HISTORY_COLUMNS if c in frame.columns]],
+                start_str,
+                today_str,
+                time.time(),
+            ),
+        )
+
+        series_path = get_series_path(symbol, cache_dir)
+        with _symbol_lock(symbol):
+            series = frame[[c for c in SERIES_COLUMNS if c in frame.columns]]
+            _write_atomic(series_path, series.reset_index(), append=False)
+            meta = _read_meta(series_path)
+            meta["last_refresh"] = today_str
+            _write_meta(series_path, meta)
+            _remove_dated_snapshots(symbol, cache_dir)
+        fetched.append(symbol)
+
+    return fetched
+
+
+def get_prefetched_ohlcv(
+    symbol: Annotated[str, "ticker symbol of the company"],
+    start_date: Annotated[str, "Start date in yyyy-mm-dd format"],
+    end_date: Annotated[str, "End date in yyyy-mm-dd format (exclusive)"],
+) -> Optional[pd.DataFrame]:
+    """Prefetched bars in [start_date, end_date), or None if not fully covered.
+
+    Once an entry is older than the core_stock_apis TTL it only serves
+    settled history (ending settled_after_days before the fetch); more
+    recent bars may have been partial when fetched, so the entry is dropped
+    and the caller downloads them again.
+    """
+    symbol = symbol.upper()
+    entry = _PREFETCHED.get(symbol)
+    if entry is None:
+        return None
+    frame, covered_start, covered_end, fetched_at = entry
+    if start_date < covered_start or end_date > covered_end:
+        return None
+
+    ttl, settled_after_days = get_freshness_settings("core_stock_apis")
+    if ttl is not None and time.time() - fetched_at > ttl:
+        settled_end = (
+            pd.Timestamp(covered_end) - pd.Timedelta(days=settled_after_days)
+        ).strftime("%Y-%m-%d")
+        if end_date > settled_end:
+            _PREFETCHED.pop(symbol)
+            return None
+    return frame[(frame.index >= start_date) & (frame.index < end_date)].copy()
+
+
+def clear_prefetched_ohlcv() -> None:
+    _PREFETCHED.clear()
@@ -0,0 +1,192 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+from typing import Annotated, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from .config import get_config
+from .utils import LRUCache
+
+# Bump when the on-disk layout changes so stale stores are rebuilt
+STORE_FORMAT_VERSION = 1
+
+# Number of memory-mapped price tables kept open per process
+_TABLE_CACHE = LRUCache(maxsize=512)
+_BUILD_LOCK = threading.Lock()
+
+
+class PriceTable:
+    """Memory-mapped columnar view of one price CSV, sorted by date."""
+
+    def __init__(
+        self,
+        columns: List[str],
+        arrays: Dict[str, np.ndarray],
+        date_keys: np.ndarray,
+        source_mtime: float,
+    ):
+        self.columns = columns
+        self.arrays = arrays
+        self.date_keys = date_keys
+        self.source_mtime = source_mtime
+
+    def __len__(self) -> int:
+        return len(self.date_keys)
+
+    def bounds(self, start_date: str, end_date: str):
+        """Return the [lo, hi) row positions covering start_date..end_date inclusive."""
+        lo = np.searchsorted(self.date_keys, np.datetime64(start_date, "D"), side="left")
+        hi = np.searchsorted(self.date_keys, np.datetime64(end_date, "D"), side="right")
+        return int(lo), int(max(lo, hi))
+
+    def slice(self, start_date: str, end_date: str) -> pd.DataFrame:
+        """Rows dated between start_date and end_date (inclusive, yyyy-mm-dd).
+
+        Columns are views over the memory-mapped arrays, and the index keeps the
+        original CSV row numbers so the output matches a filtered read_csv.
+        """
+        lo, hi = self.bounds(start_date, end_date)
+        return pd.DataFrame(
+            {col: self.arrays[col][lo:hi] for col in self.columns},
+            index=pd.RangeIndex(lo, hi),
+            copy=False,
+        )
+
+    def last_date(self) -> str:
+        if len(self.date_keys) == 0:
+            return ""
+        return str(self.date_keys[-1])
+
+
+def _store_dir(csv_path: str) -> str:
+    """Store folder for csv_path, unique per absolute path.
+
+    Data dirs often hold files with the same {SYMBOL}-YFin-data-*.csv name;
+    a folder named from the basename alone would be shared, and each source
+    would keep rebuilding the other's store.
+    """
+    csv_path = os.path.abspath(csv_path)
+    name = os.path.splitext(os.path.basename(csv_path))[0]
+    digest = hashlib.sha256(csv_path.encode()).hexdigest()[:16]
+    return os.path.join(get_config()["data_cache_dir"], "price_store", f"{name}-{digest}")
+
+
+def _read_meta(store_dir: str):
+    try:
+        with open(os.path.join(store_dir, "meta.json"), "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def _is_fresh(meta, csv_path: str) -> bool:
+    if meta is None or meta.get("format_version") != STORE_FORMAT_VERSION:
+        return False
+    if meta.get("source_path") != os.path.abspath(csv_path):
+        return False
+    stat = os.stat(csv_path)
+    return meta["source_mtime"] == stat.st_mtime and meta["source_size"] == stat.st_size
+
+
+def _build_store(csv_path: str, store_dir: str) -> None:
+    """Parse the CSV once and write one .npy file per column plus a date index."""
+    stat = os.stat(csv_path)
+    data = pd.read_csv(csv_path)
+
+    date_keys = pd.to_datetime(data["Date"].astype(str).str[:10]).values.astype(
+        "datetime64[D]"
+    )
+    # Keep row order stable for identical dates, but guarantee a sorted index
+    if len(date_keys) > 1 and (np.diff(date_keys) < np.timedelta64(0, "D")).any():
+        order = np.argsort(date_keys, kind="stable")
+        data = data.iloc[order].reset_index(drop=True)
+        date_keys = date_keys[order]
+
+    tmp_dir = store_dir + ".tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    column_files = {}
+    for i, col in enumerate(data.columns):
+        series = data[col]
+        if series.dtype == object:
+            # Fixed-width unicode keeps the column memory-mappable
+            values = series.astype(str).to_numpy(dtype=str)
+        else:
+            values = series.to_numpy()
+        file_name = f"col_{i}.npy"
+        np.save(os.path.join(tmp_dir, file_name), values, allow_pickle=False)
+        column_files[col] = file_name
+
+    np.save(os.path.join(tmp_dir, "date_keys.npy"), date_keys, allow_pickle=False)
+
+    with open(os.path.join(tmp_dir, "meta.json"), "w") as f:
+        json.dump(
+            {
+                "format_version": STORE_FORMAT_VERSION,
+                "source_path": os.path.abspath(csv_path),
+                "source_mtime": stat.st_mtime,
+                "source_size": stat.st_size,
+                "columns": list(data.columns),
+                "column_files": column_files,
+                "rows": len(data),
+            },
+            f,
+        )
+
+    shutil.rmtree(store_dir, ignore_errors=True)
+    os.replace(tmp_dir, store_dir)
+
+
+def _open_store(store_dir: str, meta) -> PriceTable:
+    arrays = {
+        col: np.load(os.path.join(store_dir, file_name), mmap_mode="r")
+        for col, file_name in meta["column_files"].items()
+    }
+    date_keys = np.load(os.path.join(store_dir, "date_keys.npy"), mmap_mode="r")
+    return PriceTable(meta["columns"], arrays, date_keys, meta["source_mtime"])
+
+
+def load_price_table(
+    csv_path: Annotated[str, "path to a {symbol}-YFin-data-*.csv price file"],
+) -> PriceTable:
+    """Return the columnar table for csv_path, converting the CSV on first use.
+
+    The converted store lives under data_cache_dir/price_store and is rebuilt
+    automatically when the source CSV changes.
+    """
+    csv_path = os.path.abspath(csv_path)
+    source_mtime = os.path.getmtime(csv_path)
+    table = _TABLE_CACHE.get(csv_path)
+    if table is not None and table.source_mtime == source_mtime:
+        return table
+
+    store_dir = _store_dir(csv_path)
+    with _BUILD_LOCK:
+        meta = _read_meta(store_dir)
+        if not _is_fresh(meta, csv_path):
+            os.makedirs(os.path.dirname(store_dir), exist_ok=True)
+            _build_store(csv_path, store_dir)
+            meta = _read_meta(store_dir)
+        table = _open_store(store_dir, meta)
+
+    _TABLE_CACHE.put(csv_path, table)
+    return table
+
+
+def get_price_range(
+    csv_path: Annotated[str, "path to a {symbol}-YFin-data-*.csv price file"],
+    start_date: Annotated[str, "Start date in yyyy-mm-dd format"],
+    end_date: Annotated[str, "End date in yyyy-mm-dd format"],
+) -> pd.DataFrame:
+    """Rows of csv_path between start_date and end_date, inclusive."""
+    return load_price_table(csv_path).slice(start_date, end_date)
+
+
+def clear_price_store_cache() -> None:
+    """Drop the in-process table handles (the on-disk stores are kept)."""
+    _TABLE_CACHE.clear()
@@ -0,0 +1,107 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows; buckets are then per-process only
+    fcntl = None
+
+
+class TokenBucketLimiter:
+    """Token buckets that every request must draw from, e.g. per minute and per day.
+
+    Each limit is (requests, period_seconds): a bucket holding up to requests
+    tokens, refilled at requests/period per second. acquire() reserves one
+    token from every bucket and sleeps until they are all covered, so threads
+    queue up in arrival order instead of retrying. With state_path the token
+    counts live in that file under an fcntl lock and are shared by every
+    process using the same path.
+    """
+
+    def __init__(self, limits: List[Tuple[float, float]], state_path: Optional[str] = None):
+        self.limits = [(float(requests), float(period)) for requests, period in limits]
+        self.state_path = state_path if fcntl is not None else None
+        self._lock = threading.Lock()
+        self._tokens = [requests for requests, _ in self.limits]
+        self._updated = time.time()
+        if self.state_path:
+            os.makedirs(os.path.dirname(os.path.abspath(self.state_path)), exist_ok=True)
+
+    @contextmanager
+    def _state(self):
+        """Current (tokens, updated) under the thread lock and, if shared, the file lock."""
+        with self._lock:
+            if not self.state_path:
+                state = {"tokens": self._tokens, "updated": self._updated}
+                yield state
+                self._tokens, self._updated = state["tokens"], state["updated"]
+                return
+
+            with open(self.state_path, "a+") as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    f.seek(0)
+                    try:
+                        state = json.loads(f.read())
+                        if len(state["tokens"]) != len(self.limits):
+                            raise ValueError("limits changed")
+                    except (ValueError, KeyError):
+                        state = {
+                            "tokens": [requests for requests, _ in self.limits],
+                            "updated": time.time(),
+                        }
+                    yield state
+                    f.seek(0)
+                    f.truncate()
+                    f.write(json.dumps(state))
+                    f.flush()
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _refill(self, state: dict, now: float) -> List[float]:
+        elapsed = max(0.0, now - state["updated"])
+        return [
+            min(requests, tokens + elapsed * requests / period)
+            for tokens, (requests, period) in zip(state["tokens"], self.limits)
+        ]
+
+    def acquire(self, max_wait: Optional[float] = None) -> Optional[float]:
+        """Take one token from every bucket, sleeping until they are available.
+
+        Returns the seconds waited, or None without taking anything if the
+        wait would exceed max_wait.
+        """
+        with self._state() as state:
+            now = time.time()
+            tokens = self._refill(state, now)
+            wait = max(
+                max(0.0, (1 - available) * period / requests)
+                for available, (requests, period) in zip(tokens, self.limits)
+            )
+            if max_wait is not None and wait > max_wait:
+                state["tokens"], state["updated"] = tokens, now
+                return None
+            # Reserve now (tokens may go negative) so later callers queue behind us
+            state["tokens"] = [available - 1 for available in tokens]
+            state["updated"] = now
+
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def drain(self) -> None:
+        """Empty the shortest-period bucket, e.g. after the server rejected a request.
+
+        Later callers then wait for it to refill; longer buckets are left
+        alone since the rejection does not say which quota was hit.
+        """
+        shortest = min(range(len(self.limits)), key=lambda i: self.limits[i][1])
+        with self._state() as state:
+            now = time.time()
+            tokens = self._refill(state, now)
+            tokens[shortest] = min(0.0, tokens[shortest])
+            state["tokens"], state["updated"] = tokens, now
@@ -6,6 +6,11 @@ from contextlib import contextmanager
 from typing import Annotated
 import os
 import re
+from functools import lru_cache
+from .config import get_config
+
+# jsonl path -> loaded on-disk date index
+_INDEX_CACHE = {}
 
 ticker_to_company = {
     "AAPL": "Apple",
@@ -49,87 +54,244 @@ ticker_to_company = {
 }
 
 
-def fetch_top_from_category(
+def _index_file_path(category: str, data_file: str) -> str:
+    return os.path.join(
+        get_config()["data_cache_dir"], "reddit_index", category, data_file + ".idx.json"
+    )
+
+
+def _build_subreddit_index(jsonl_path: str, index_path: str) -> dict:
+    """Scan a subreddit .jsonl file once and bucket line offsets by UTC post date."""
+    stat = os.stat(jsonl_path)
+    dates = {}
+    offset = 0
+    with open(jsonl_path, "rb") as f:
+        for line in f:
+            line_offset = offset
+            offset += len(line)
+            # skip empty lines
+            if not line.strip():
+                continue
+
+            created_utc = json.loads(line)["created_utc"]
+            post_date = datetime.utcfromtimestamp(created_utc).strftime("%Y-%m-%d")
+            dates.setdefault(post_date, []).append([line_offset, len(line)])
+
+    index = {
+        "source_mtime": stat.st_mtime,
+        "source_size": stat.st_size,
+        "dates": dates,
+    }
+    os.makedirs(os.path.dirname(index_path), exist_ok=True)
+    tmp_path = index_path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(index, f)
+    os.replace(tmp_path, index_path)
+    return index
+
+
+def load_subreddit_index(jsonl_path: str, category: str) -> dict:
+    """Return the {date: [[offset, length], ...]} index for a subreddit file.
+
+    The index is built on first use and rebuilt when the .jsonl file changes.
+    """
+    stat = os.stat(jsonl_path)
+    cached = _INDEX_CACHE.get(jsonl_path)
+    if cached is not None and cached["source_mtime"] == stat.st_mtime:
+        return cached["dates"]
+
+    index_path = _index_file_path(category, os.path.basename(jsonl_path))
+    index = None
+    try:
+        with open(index_path, "r") as f:
+            index = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        pass
+
+    if (
+        index is None
+        or index["source_mtime"] != stat.st_mtime
+        or index["source_size"] != stat.st_size
+    ):
+        index = _build_subreddit_index(jsonl_path, index_path)
+
+    _INDEX_CACHE[jsonl_path] = index
+    return index["dates"]
+
+
+@lru_cache(maxsize=None)
+def get_company_matcher(query: str) -> "re.Pattern":
+    """Compiled, case-insensitive alternation of all search terms for a ticker.
+
+    Terms are the " OR "-separated company names plus the ticker itself, kept
+    as regular expressions exactly like the former per-term re.search calls.
+    """
+    search_terms = ticker_to_company[query].split(" OR ")
+    search_terms.append(query)
+    return re.compile("|".join(f"(?:{term})" for term in search_terms), re.IGNORECASE)
+
+
+@lru_cache(maxsize=64)
+def _get_any_company_matcher(queries: tuple) -> "re.Pattern":
+    """Single alternation over every query's terms, used to skip unrelated posts."""
+    return re.compile(
+        "|".join(f"(?:{get_company_matcher(q).pattern})" for q in queries),
+        re.IGNORECASE,
+    )
+
+
+def tag_post_tickers(title: str, selftext: str, queries: tuple) -> list:
+    """Return every ticker in queries whose company terms appear in the post.
+
+    One combined regex rejects the (common) posts that mention none of them;
+    only posts that pass are checked against the per-ticker matchers.
+    """
+    prefilter = _get_any_company_matcher(queries)
+    if not (prefilter.search(title) or prefilter.search(selftext)):
+        return []
+    return [
+        q
+        for q in queries
+        if get_company_matcher(q).search(title) or get_company_matcher(q).search(selftext)
+    ]
+
+
+def fetch_top_from_category_multi(
     category: Annotated[
         str, "Category to fetch top post from. Collection of subreddits."
     ],
-    date: Annotated[str, "Date to fetch top posts from."],
-    max_limit: Annotated[int, "Maximum number of posts to fetch."],
-    query: Annotated[str, "Optional query to search for in the subreddit."] = None,
+    start_date: Annotated[str, "First date to fetch top posts from, yyyy-mm-dd."],
+    end_date: Annotated[str, "Last date to fetch top posts from, yyyy-mm-dd."],
+    max_limit: Annotated[int, "Maximum number of posts to fetch per day."],
+    queries: Annotated[list, "Tickers to search for; [None] for no filtering."],
     data_path: Annotated[
         str,
         "Path to the data folder. Default is 'reddit_data'.",
     ] = "reddit_data",
-):
-    base_path = data_path
+) -> dict:
+    """Top posts per query for every day in start_date..end_date.
 
-    all_content = []
+    Every post in the window is read and parsed once and tagged with all the
+    queries it mentions, so N tickers cost one scan instead of N.
+    """
+    base_path = data_path
+    category_files = os.listdir(os.path.join(base_path, category))
 
-    if max_limit < len(os.listdir(os.path.join(base_path, category))):
+    if max_limit < len(category_files):
         raise ValueError(
             "REDDIT FETCHING ERROR: max limit is less than the number of files in the category. Will not be able to fetch any posts"
         )
 
-    limit_per_subreddit = max_limit // len(
-        os.listdir(os.path.join(base_path, category))
+    limit_per_subreddit = max_limit // len(category_files)
+
+    # if is company_news, check that the title or the content has the company's name (query) mentioned
+    filter_queries = tuple(
+        q for q in queries if q is not None and "company" in category
     )
+    unfiltered = [q for q in queries if q not in filter_queries]
+
+    # (query, date, data_file) -> posts, so results keep the day-by-day, file-by-file order
+    bucketed = {}
+    data_files = []
 
-    for data_file in os.listdir(os.path.join(base_path, category)):
+    for data_file in category_files:
         # check if data_file is a .jsonl file
         if not data_file.endswith(".jsonl"):
             continue
+        data_files.append(data_file)
 
-        all_content_curr_subreddit = []
-
-        with open(os.path.join(base_path, category, data_file), "rb") as f:
-            for i, line in enumerate(f):
-                # skip empty lines
-                if not line.strip():
-                    continue
-
-                parsed_line = json.loads(line)
-
-                # select only lines that are from the date
-                post_date = datetime.utcfromtimestamp(
-                    parsed_line["created_utc"]
-                ).strftime("%Y-%m-%d")
-                if post_date != date:
-                    continue
-
-                # if is company_news, check that the title or the content has the company's name (query) mentioned
-                if "company" in category and query:
-                    search_terms = []
-                    if "OR" in ticker_to_company[query]:
-                        search_terms = ticker_to_company[query].split(" OR ")
-                    else:
-                        search_terms = [ticker_to_company[query]]
-
-                    search_terms.append(query)
-
-                    found = False
-                    for term in search_terms:
-                        if re.search(
-                            term, parsed_line["title"], re.IGNORECASE
-                        ) or re.search(term, parsed_line["selftext"], re.IGNORECASE):
-                            found = True
-                            break
-
-                    if not found:
+        jsonl_path = os.path.join(base_path, category, data_file)
+        date_index = load_subreddit_index(jsonl_path, category)
+        wanted = sorted(d for d in date_index if start_date <= d <= end_date)
+        if not wanted:
+            continue
+
+        with open(jsonl_path, "rb") as f:
+            for post_date in wanted:
+                content_by_query = {q: [] for q in queries}
+
+                for line_offset, length in date_index[post_date]:
+                    f.seek(line_offset)
+                    parsed_line = json.loads(f.read(length))
+
+                    matched = list(unfiltered)
+                    if filter_queries:
+                        matched += tag_post_tickers(
+                            parsed_line["title"], parsed_line["selftext"], filter_queries
+                        )
+                    if not matched:
                         continue
 
-                post = {
-                    "title": parsed_line["title"],
-                    "content": parsed_line["selftext"],
-                    "url": parsed_line["url"],
-                    "upvotes": parsed_line["ups"],
-                    "posted_date": post_date,
-                }
+                    post = {
+                        "title": parsed_line["title"],
+                        "content": parsed_line["selftext"],
+                        "url": parsed_line["url"],
+                        "upvotes": parsed_line["ups"],
+                        "posted_date": post_date,
+                    }
 
-                all_content_curr_subreddit.append(post)
+                    for q in matched:
+                        content_by_query[q].append(post)
 
-        # sort all_content_curr_subreddit by upvote_ratio in descending order
-        all_content_curr_subreddit.sort(key=lambda x: x["upvotes"], reverse=True)
+                for q, all_content_curr_subreddit in content_by_query.items():
+                    # sort all_content_curr_subreddit by upvote_ratio in descending order
+                    all_content_curr_subreddit.sort(
+                        key=lambda x: x["upvotes"], reverse=True
+                    )
+                    bucketed[(q, post_date, data_file)] = all_content_curr_subreddit[
+                        :limit_per_subreddit
+                    ]
 
-        all_content.extend(all_content_curr_subreddit[:limit_per_subreddit])
+    results = {}
+    for q in queries:
+        all_content = []
+        curr_date = datetime.strptime(start_date, "%Y-%m-%d")
+        end_date_dt = datetime.strptime(end_date, "%Y-%m-%d")
+        while curr_date <= end_date_dt:
+            curr_date_str = curr_date.strftime("%Y-%m-%d")
+            for data_file in data_files:
+                all_content.extend(bucketed.get((q, curr_date_str, data_file), []))
+            curr_date += timedelta(days=1)
+        results[q] = all_content
+
+    return results
+
+
+def fetch_top_from_category_range(
+    category: Annotated[
+        str, "Category to fetch top post from. Collection of subreddits."
+    ],
+    start_date: Annotated[str, "First date to fetch top posts from, yyyy-mm-dd."],
+    end_date: Annotated[str, "Last date to fetch top posts from, yyyy-mm-dd."],
+    max_limit: Annotated[int, "Maximum number of posts to fetch per day."],
+    query: Annotated[str, "Optional query to search for in the subreddit."] = None,
+    data_path: Annotated[
+        str,
+        "Path to the data folder. Default is 'reddit_data'.",
+    ] = "reddit_data",
+):
+    """Top posts for every day in start_date..end_date using the per-date index.
 
-    return all_content
+    Equivalent to calling fetch_top_from_category once per day, but only the
+    posts dated inside the window are read from disk.
+    """
+    return fetch_top_from_category_multi(
+        category, start_date, end_date, max_limit, [query], data_path=data_path
+    )[query]
+
+
+def fetch_top_from_category(
+    category: Annotated[
+        str, "Category to fetch top post from. Collection of subreddits."
+    ],
+    date: Annotated[str, "Date to fetch top posts from."],
+    max_limit: Annotated[int, "Maximum number of posts to fetch."],
+    query: Annotated[str, "Optional query to search for in the subreddit."] = None,
+    data_path: Annotated[
+        str,
+        "Path to the data folder. Default is 'reddit_data'.",
+    ] = "reddit_data",
+):
+    return fetch_top_from_category_range(
+        category, date, date, max_limit, query, data_path=data_path
+    )
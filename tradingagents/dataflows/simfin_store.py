@@ -0,0 +1,98 @@
+import os
+import threading
+from typing import Annotated, Optional
+
+import numpy as np
+import pandas as pd
+
+from .utils import LRUCache
+
+# Six tables cover balance sheet, cash flow and income statement at both
+# annual and quarterly frequency; older tables are evicted beyond that.
+_INDEX_CACHE = LRUCache(maxsize=6)
+_LOAD_LOCK = threading.Lock()
+
+
+class FundamentalsIndex:
+    """One SimFin statement table sorted by (Ticker, Publish Date).
+
+    Rows for a ticker are contiguous, so the latest report published on or
+    before a date is a dict lookup followed by a binary search.
+    """
+
+    def __init__(self, df: pd.DataFrame, source_mtime: float):
+        # Stable sort keeps the original row order among equal publish dates,
+        # and the original index labels are kept for printing.
+        df = df.sort_values(["Ticker", "Publish Date"], kind="stable")
+        self.df = df
+        self.source_mtime = source_mtime
+        self.publish_dates = df["Publish Date"].to_numpy(dtype="datetime64[ns]")
+
+        tickers = df["Ticker"].to_numpy(dtype=object)
+        self.ticker_bounds = {}
+        start = 0
+        for i in range(1, len(tickers) + 1):
+            if i == len(tickers) or tickers[i] != tickers[start]:
+                self.ticker_bounds[tickers[start]] = (start, i)
+                start = i
+
+    def latest_on_or_before(self, ticker: str, curr_date: str) -> Optional[pd.Series]:
+        bounds = self.ticker_bounds.get(ticker)
+        if bounds is None:
+            return None
+        lo, hi = bounds
+        curr_date_dt = pd.to_datetime(curr_date, utc=True).normalize()
+        target = np.datetime64(curr_date_dt.tz_convert(None), "ns")
+
+        dates = self.publish_dates[lo:hi]
+        pos = int(np.searchsorted(dates, target, side="right")) - 1
+        if pos < 0:
+            return None
+        # idxmax returns the first row with the latest publish date
+        pos = int(np.searchsorted(dates, dates[pos], side="left"))
+        return self.df.iloc[lo + pos]
+
+
+def _load_index(data_path: str, source_mtime: float) -> FundamentalsIndex:
+    df = pd.read_csv(data_path, sep=";")
+
+    # Convert date strings to datetime objects and remove any time components
+    df["Report Date"] = pd.to_datetime(df["Report Date"], utc=True).dt.normalize()
+    df["Publish Date"] = pd.to_datetime(df["Publish Date"], utc=True).dt.normalize()
+
+    return FundamentalsIndex(df, source_mtime)
+
+
+def get_fundamentals_index(
+    data_path: Annotated[str, "path to a SimFin us-*-{freq}.csv statement file"],
+) -> FundamentalsIndex:
+    """Return the process-wide index for data_path, loading it on first use.
+
+    The index is reused across TradingAgentsGraph.propagate calls and reloaded
+    only when the CSV on disk changes.
+    """
+    source_mtime = os.path.getmtime(data_path)
+    index = _INDEX_CACHE.get(data_path)
+    if index is not None and index.source_mtime == source_mtime:
+        return index
+
+    with _LOAD_LOCK:
+        # Another thread may have loaded it while we waited
+        index = _INDEX_CACHE.get(data_path)
+        if index is None or index.source_mtime != source_mtime:
+            index = _load_index(data_path, source_mtime)
+            _INDEX_CACHE.put(data_path, index)
+    return index
+
+
+def get_latest_statement(
+    data_path: Annotated[str, "path to a SimFin us-*-{freq}.csv statement file"],
+    ticker: Annotated[str, "ticker symbol"],
+    curr_date: Annotated[str, "current date you are trading at, yyyy-mm-dd"],
+) -> Optional[pd.Series]:
+    """Latest statement row for ticker published on or before curr_date, or None."""
+    return get_fundamentals_index(data_path).latest_on_or_before(ticker, curr_date)
+
+
+def clear_fundamentals_cache() -> None:
+    _INDEX_CACHE.clear()
@@ -0,0 +1,321 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import date, timedelta
+from typing import Annotated, Optional
+
+from .config import get_config
+
+_DATE_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+# Vendor replies that report a failure or an empty period rather than data
+_NOT_CACHEABLE = re.compile(
+    r"^\s*(Error|No (\w+ )*data (found|available))"
+    r"|No data available for the specified date range",
+    re.IGNORECASE,
+)
+
+# Used for any setting missing from config["tool_cache"]
+DEFAULT_TOOL_CACHE_CONFIG = {
+    "enabled": False,
+    "path": None,  # Defaults to data_cache_dir/tool_cache.sqlite
+    "max_size_mb": 512,
+    # Date arguments at least this many days old count as settled history;
+    # vendors still backfill and revise the last day or two
+    "settled_after_days": 2,
+    # Seconds a result stays valid when any date argument is not settled
+    "ttl": {
+        "core_stock_apis": 6 * 3600,
+        "technical_indicators": 6 * 3600,
+        "fundamental_data": 24 * 3600,
+        "news_data": 3600,
+    },
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    method TEXT NOT NULL,
+    vendor TEXT NOT NULL,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL,
+    last_access REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS results_last_access ON results (last_access);
+"""
+
+# Puts between full size scans; in between, the size is tracked from this
+# process's own writes (other processes sharing the file are seen at the scan)
+SIZE_CHECK_INTERVAL = 256
+
+_STATS_LOCK = threading.Lock()
+_STATS = {"hits": 0, "misses": 0, "stores": 0, "expired": 0, "evictions": 0}
+
+_LOCAL = threading.local()  # .connections: db path -> this thread's connection
+_SCHEMA_LOCK = threading.Lock()
+_SCHEMA_READY = set()  # db paths whose schema exists
+_SIZE_LOCK = threading.Lock()
+_SIZES = {}  # db path -> [estimated total bytes, puts since the last full scan]
+# db path -> {key: last access time} of hits not yet written; flushed in one
+# transaction every SIZE_CHECK_INTERVAL hits and before each size scan, so
+# hits stay read-only and do not serialize readers on the WAL write lock
+_PENDING_ACCESS = {}
+
+
+def _settings() -> dict:
+    overrides = get_config().get("tool_cache", {})
+    settings = {**DEFAULT_TOOL_CACHE_CONFIG, **overrides}
+    settings["ttl"] = {**DEFAULT_TOOL_CACHE_CONFIG["ttl"], **overrides.get("ttl", {})}
+    return settings
+
+
+def _db_path(settings: dict) -> str:
+    return settings["path"] or os.path.join(
+        get_config()["data_cache_dir"], "tool_cache.sqlite"
+    )
+
+
+def _connect(settings: dict) -> sqlite3.Connection:
+    """This thread's connection to the cache database, opened on first use.
+
+    The schema and WAL mode are set up once per database path per process.
+    """
+    db_path = _db_path(settings)
+    connections = getattr(_LOCAL, "connections", None)
+    if connections is None:
+        connections = _LOCAL.connections = {}
+    conn = connections.get(db_path)
+    if conn is not None:
+        return conn
+
+    os.makedirs(os.path.dirname(db_path), exist_ok=True)
+    conn = sqlite3.connect(db_path, timeout=30)
+    with _SCHEMA_LOCK:
+        if db_path not in _SCHEMA_READY:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            _SCHEMA_READY.add(db_path)
+    connections[db_path] = conn
+    return conn
+
+
+def _count(stat: str, n: int = 1) -> None:
+    with _STATS_LOCK:
+        _STATS[stat] += n
+
+
+def is_tool_cache_enabled() -> bool:
+    return bool(_settings()["enabled"])
+
+
+def get_freshness_settings(category: str) -> tuple:
+    """(ttl seconds or None, settled_after_days) configured for a tool category.
+
+    Shared with the in-memory OHLCV prefetch so both caches agree on how
+    long current data stays valid.
+    """
+    settings = _settings()
+    return settings["ttl"].get(category), settings["settled_after_days"]
+
+
+def make_cache_key(
+    method: Annotated[str, "routed method name, e.g. get_news"],
+    vendor: Annotated[str, "vendor the implementation belongs to"],
+    impl_name: Annotated[str, "name of the vendor implementation function"],
+    args: tuple,
+    kwargs: dict,
+) -> str:
+    """Content address of one vendor call."""
+    payload = json.dumps(
+        [method, vendor, impl_name, list(args), kwargs], sort_keys=True, default=str
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _is_historical(args: tuple, kwargs: dict, settled_after_days: int) -> bool:
+    """True if the call has date arguments and all are settled_after_days old or more.
+
+    Such results describe a closed period and are kept until evicted.
+    """
+    dates = [
+        value
+        for value in list(args) + list(kwargs.values())
+        if isinstance(value, str) and _DATE_PATTERN.match(value)
+    ]
+    cutoff = (date.today() - timedelta(days=settled_after_days)).isoformat()
+    return len(dates) > 0 and all(d <= cutoff for d in dates)
+
+
+def _is_cacheable(result) -> bool:
+    """Whether result holds data: not empty, header-only, an error or a no-data notice."""
+    if not isinstance(result, str):
+        return False
+    body = [
+        line
+        for line in result.splitlines()
+        if line.strip() and not line.lstrip().startswith("#")
+    ]
+    return bool(body) and not _NOT_CACHEABLE.search(result)
+
+
+def get_cached_result(key: str) -> Optional[str]:
+    """Cached result for key, or None on a miss or an expired entry."""
+    settings = _settings()
+    now = time.time()
+    conn = _connect(settings)
+    row = conn.execute(
+        "SELECT value, expires_at FROM results WHERE key = ?", (key,)
+    ).fetchone()
+    if row is None:
+        _count("misses")
+        return None
+    value, expires_at = row
+    db_path = _db_path(settings)
+    if expires_at is not None and expires_at <= now:
+        with conn:
+            conn.execute("DELETE FROM results WHERE key = ?", (key,))
+        _count("expired")
+        _count("misses")
+        return None
+
+    with _SIZE_LOCK:
+        pending = _PENDING_ACCESS.setdefault(db_path, {})
+        pending[key] = now
+        flush_due = len(pending) >= SIZE_CHECK_INTERVAL
+    if flush_due:
+        with conn:
+            _flush_access_times(conn, db_path)
+    _count("hits")
+    return value
+
+
+def _flush_access_times(conn: sqlite3.Connection, db_path: str) -> None:
+    """Write the batched last_access times of db_path; the caller commits."""
+    with _SIZE_LOCK:
+        pending = _PENDING_ACCESS.pop(db_path, None)
+    if pending:
+        conn.executemany(
+            "UPDATE results SET last_access = ? WHERE key = ? AND last_access < ?",
+            [(accessed, key, accessed) for key, accessed in pending.items()],
+        )
+
+
+def put_cached_result(
+    key: str,
+    method: str,
+    category: str,
+    vendor: str,
+    args: tuple,
+    kwargs: dict,
+    result,
+) -> bool:
+    """Store a successful result; returns False if it is not cacheable.
+
+    Only strings with data are stored; errors, empty replies and no-data
+    notices are skipped so the call is retried next time.
+    """
+    if not _is_cacheable(result):
+        return False
+
+    settings = _settings()
+    now = time.time()
+    if _is_historical(args, kwargs, settings["settled_after_days"]):
+        expires_at = None
+    else:
+        ttl = settings["ttl"].get(category)
+        expires_at = None if ttl is None else now + ttl
+
+    size = len(result.encode())
+    max_bytes = int(settings["max_size_mb"] * 1024 * 1024)
+    conn = _connect(settings)
+    with conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO results "
+            "(key, method, vendor, value, size, created_at, expires_at, last_access) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (key, method, vendor, result, size, now, expires_at, now),
+        )
+        if _needs_size_check(_db_path(settings), size, max_bytes):
+            # Eviction order must see the batched hits
+            _flush_access_times(conn, _db_path(settings))
+            _evict(conn, _db_path(settings), max_bytes)
+    _count("stores")
+    return True
+
+
+def _needs_size_check(db_path: str, size: int, max_bytes: int) -> bool:
+    """Add size to the running total; True when a full size scan is due.
+
+    A scan is due once the estimate passes max_bytes, every
+    SIZE_CHECK_INTERVAL puts, and on the first put to db_path.
+    """
+    with _SIZE_LOCK:
+        tracked = _SIZES.get(db_path)
+        if tracked is None:
+            return True
+        tracked[0] += size
+        tracked[1] += 1
+        return tracked[0] > max_bytes or tracked[1] >= SIZE_CHECK_INTERVAL
+
+
+def _evict(conn: sqlite3.Connection, db_path: str, max_bytes: int) -> None:
+    """Drop least recently used entries until the cache fits in max_bytes."""
+    total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+    if total <= max_bytes:
+        with _SIZE_LOCK:
+            _SIZES[db_path] = [total, 0]
+        return
+
+    excess = total - max_bytes
+    victims = []
+    for key, size in conn.execute(
+        "SELECT key, size FROM results ORDER BY last_access"
+    ):
+        victims.append((key,))
+        excess -= size
+        if excess <= 0:
+            break
+    conn.executemany("DELETE FROM results WHERE key = ?", victims)
+    with _SIZE_LOCK:
+        _SIZES[db_path] = [max_bytes + excess, 0]
+    _count("evictions", len(victims))
+
+
+def get_tool_cache_stats() -> dict:
+    """Hit/miss counters for this process plus the current size on disk."""
+    with _STATS_LOCK:
+        stats = dict(_STATS)
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+
+    settings = _settings()
+    if os.path.exists(_db_path(settings)):
+        entries, size = _connect(settings).execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results"
+        ).fetchone()
+    else:
+        entries, size = 0, 0
+    stats["entries"] = entries
+    stats["size_bytes"] = size
+    return stats
+
+
+def clear_tool_cache() -> None:
+    """Delete every cached result and reset the counters."""
+    settings = _settings()
+    db_path = _db_path(settings)
+    if os.path.exists(db_path):
+        conn = _connect(settings)
+        with conn:
+            conn.execute("DELETE FROM results")
+    with _SIZE_LOCK:
+        _SIZES.pop(db_path, None)
+        _PENDING_ACCESS.pop(db_path, None)
+    with _STATS_LOCK:
+        for stat in _STATS:
+            _STATS[stat] = 0
@@ -0,0 +1,188 @@
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+from .config import get_config
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Used for any setting missing from config["vendor_circuit_breaker"]
+DEFAULT_CIRCUIT_BREAKER_CONFIG = {
+    "enabled": True,
+    "window": 20,  # Calls in the rolling success rate
+    "min_calls": 5,  # Calls in the window before the success rate can open the circuit
+    "failure_threshold": 0.5,  # Failure rate that opens the circuit
+    "open_seconds": 60,  # Time an open vendor is skipped before one probe call
+    "ewma_alpha": 0.2,  # Weight of the newest call in the latency EWMA
+}
+
+_LOCK = threading.Lock()
+# Keyed by (vendor, impl name): one failing implementation, e.g. the Google
+# news scraper under "local", must not open the vendor's other implementations
+_VENDORS = {}
+
+
+class _VendorHealth:
+    def __init__(self, window: int):
+        self.outcomes = deque(maxlen=window)
+        self.state = CLOSED
+        self.opened_at = None
+        self.probe_in_flight = False
+        self.probe_started = None
+        self.calls = 0
+        self.failures = 0
+        self.rate_limited = 0
+        self.times_opened = 0
+        self.latency_ewma = None
+        self.last_error = None
+
+    def open(self, now: float) -> None:
+        self.state = OPEN
+        self.opened_at = now
+        self.probe_in_flight = False
+        self.times_opened += 1
+
+
+def _settings() -> dict:
+    return {
+        **DEFAULT_CIRCUIT_BREAKER_CONFIG,
+        **get_config().get("vendor_circuit_breaker", {}),
+    }
+
+
+def _vendor(vendor: str, impl: str, settings: dict) -> _VendorHealth:
+    health = _VENDORS.get((vendor, impl))
+    if health is None:
+        health = _VENDORS[(vendor, impl)] = _VendorHealth(settings["window"])
+    return health
+
+
+def _refuses_calls(health: _VendorHealth, settings: dict, now: float) -> bool:
+    if health.state == OPEN:
+        return now - health.opened_at < settings["open_seconds"]
+    if health.state == HALF_OPEN:
+        return (
+            health.probe_in_flight
+            and now - health.probe_started < settings["open_seconds"]
+        )
+    return False
+
+
+def is_vendor_open(vendor: str, impl: str) -> bool:
+    """Whether the implementation's circuit currently refuses calls; does not claim a probe."""
+    settings = _settings()
+    if not settings["enabled"]:
+        return False
+    with _LOCK:
+        return _refuses_calls(_vendor(vendor, impl, settings), settings, time.monotonic())
+
+
+def is_vendor_available(vendor: str, impl: str) -> bool:
+    """Whether calls should go to this vendor implementation now.
+
+    An open circuit refuses calls until open_seconds have passed; it then
+    lets a single probe through (half-open) and refuses everyone else until
+    that probe's outcome is recorded, or until open_seconds pass again in
+    case the probe was never made.
+    """
+    settings = _settings()
+    if not settings["enabled"]:
+        return True
+    now = time.monotonic()
+    with _LOCK:
+        health = _vendor(vendor, impl, settings)
+        if health.state == CLOSED:
+            return True
+        if _refuses_calls(health, settings, now):
+            return False
+        health.state = HALF_OPEN
+        health.probe_in_flight = True
+        health.probe_started = now
+        return True
+
+
+def record_vendor_call(
+    vendor: str,
+    impl: str,
+    succeeded: bool,
+    duration: float,
+    rate_limited: bool = False,
+    error: Optional[BaseException] = None,
+) -> None:
+    """Feed one call's outcome into the implementation's health and circuit state.
+
+    A rate-limit error opens the circuit at once; other failures open it
+    when the rolling failure rate reaches failure_threshold.
+    """
+    settings = _settings()
+    now = time.monotonic()
+    with _LOCK:
+        health = _vendor(vendor, impl, settings)
+        health.calls += 1
+        health.outcomes.append(succeeded)
+        alpha = settings["ewma_alpha"]
+        health.latency_ewma = (
+            duration
+            if health.latency_ewma is None
+            else alpha * duration + (1 - alpha) * health.latency_ewma
+        )
+        if not succeeded:
+            health.failures += 1
+            health.rate_limited += int(rate_limited)
+            if error is not None:
+                health.last_error = f"{type(error).__name__}: {error}"
+
+        if not settings["enabled"]:
+            return
+
+        if health.state == HALF_OPEN:
+            if succeeded:
+                health.state = CLOSED
+                health.probe_in_flight = False
+                health.outcomes.clear()
+            else:
+                health.open(now)
+        elif health.state == CLOSED and not succeeded:
+            failure_rate = health.outcomes.count(False) / len(health.outcomes)
+            if rate_limited or (
+                len(health.outcomes) >= settings["min_calls"]
+                and failure_rate >= settings["failure_threshold"]
+            ):
+                health.open(now)
+
+
+def get_vendor_health() -> dict:
+    """State, rolling success rate, latency EWMA and counters, as {vendor: {impl: ...}}."""
+    now = time.monotonic()
+    report = {}
+    with _LOCK:
+        for (vendor, impl), health in _VENDORS.items():
+            report.setdefault(vendor, {})[impl] = {
+                "state": health.state,
+                "success_rate": (
+                    health.outcomes.count(True) / len(health.outcomes)
+                    if health.outcomes
+                    else None
+                ),
+                "latency_ewma": health.latency_ewma,
+                "calls": health.calls,
+                "failures": health.failures,
+                "rate_limited": health.rate_limited,
+                "times_opened": health.times_opened,
+                "open_for": (
+                    now - health.opened_at if health.state != CLOSED else None
+                ),
+                "last_error": health.last_error,
+            }
+    return report
+
+
+def reset_vendor_health(vendor: Optional[str] = None, impl: Optional[str] = None) -> None:
+    """Forget the health of one implementation, of one vendor, or of all vendors."""
+    with _LOCK:
+        for key in list(_VENDORS):
+            if (vendor is None or key[0] == vendor) and (impl is None or key[1] == impl):
+                del _VENDORS[key]
@@ -0,0 +1,120 @@
+import json
+import logging
+import os
+import sys
+import time
+from typing import Optional
+
+# Silent unless configure_vendor_logging (or the application) adds a handler;
+# the level is left to the application until vendor_log_level is configured
+logger = logging.getLogger("tradingagents.vendors")
+logger.addHandler(logging.NullHandler())
+
+_HANDLERS = []
+
+
+class NDJSONHandler(logging.FileHandler):
+    """Appends one JSON object per vendor event to a file."""
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        super().__init__(path, mode="a", encoding="utf-8")
+
+    def format(self, record: logging.LogRecord) -> str:
+        event = getattr(record, "vendor_event", None) or {"message": record.getMessage()}
+        return json.dumps(
+            {"ts": record.created, "level": record.levelname, **event}, default=str
+        )
+
+
+def configure_vendor_logging(
+    level: Optional[str] = None, ndjson_path: Optional[str] = None
+) -> None:
+    """Enable vendor routing logs.
+
+    level (e.g. "DEBUG", "INFO") prints events to stderr; ndjson_path writes
+    every event at that level (DEBUG if no level is given) to a file. With
+    neither, nothing is changed: the logger keeps whatever level and
+    handlers the application gave it, and routing pays only an isEnabledFor
+    check.
+    """
+    if level is None and ndjson_path is None:
+        return
+
+    for handler in _HANDLERS:
+        logger.removeHandler(handler)
+        handler.close()
+    _HANDLERS.clear()
+
+    logger.setLevel(level.upper() if level else logging.DEBUG)
+    if level:
+        stream_handler = logging.StreamHandler(sys.stderr)
+        stream_handler.setFormatter(
+            logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+        )
+        _HANDLERS.append(stream_handler)
+    if ndjson_path:
+        _HANDLERS.append(NDJSONHandler(ndjson_path))
+    for handler in _HANDLERS:
+        logger.addHandler(handler)
+
+
+def _result_size(result) -> int:
+    if result is None:
+        return 0
+    return len((result if isinstance(result, str) else str(result)).encode())
+
+
+def log_vendor_call(
+    method: str,
+    vendor: str,
+    impl: str,
+    attempt: Optional[int],
+    started: float,
+    outcome: str,
+    result=None,
+    error: Optional[BaseException] = None,
+) -> None:
+    """One record per vendor implementation call.
+
+    outcome is success, cache_hit, rate_limited, error or timeout; started is
+    the time.perf_counter() value taken before the call.
+    """
+    level = logging.DEBUG if outcome in ("success", "cache_hit") else logging.WARNING
+    if not logger.isEnabledFor(level):
+        return
+    event = {
+        "event": "vendor_call",
+        "method": method,
+        "vendor": vendor,
+        "impl": impl,
+        "attempt": attempt,
+        "duration": time.perf_counter() - started,
+        "outcome": outcome,
+        "result_size": _result_size(result),
+        "error": None if error is None else f"{type(error).__name__}: {error}",
+    }
+    logger.log(
+        level,
+        "%s %s via %s.%s in %.3fs%s",
+        method,
+        outcome,
+        vendor,
+        impl,
+        event["duration"],
+        "" if error is None else f" ({event['error']})",
+        extra={"vendor_event": event},
+    )
+
+
+def log_route(method: str, level: int, message: str, **fields) -> None:
+    """A routing-level event (fallback order, vendor outcome, final result)."""
+    if not logger.isEnabledFor(level):
+        return
+    logger.log(
+        level,
+        "%s: %s",
+        method,
+        message,
+        extra={"vendor_event": {"event": "route", "method": method, "message": message, **fields}},
+    )
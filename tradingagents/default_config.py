@@ -14,6 +14,18 @@ DEFAULT_CONFIG = {
     "max_debate_rounds": 1,
     "max_risk_discuss_rounds": 1,
     "max_recur_limit": 100,
+    # Debate turns sent verbatim to each debater and judge; earlier turns are cut
+    # to their opening sentence (None sends the full history)
+    "debate_history_window": 6,
+    # SQLite file for LangGraph checkpoints (resume/replay); needs langgraph-checkpoint-sqlite
+    "checkpoint_db": None,
+    # Directory for per-run node telemetry JSON files (None keeps it in memory only)
+    "telemetry_dir": None,
+    # Run the selected analysts concurrently instead of one after another
+    "parallel_analysts": False,
+    # Directory for persistent memory collections (None keeps memories in-process only)
+    "memory_persist_dir": None,
+    "memory_backend": "chroma",  # Options: chroma, numpy (exact kNN, no chromadb needed)
     # Data vendor configuration
     # Category-level configuration (default for all tools in category)
     "data_vendors": {
@@ -27,4 +39,47 @@ DEFAULT_CONFIG = {
         # Example: "get_stock_data": "alpha_vantage",  # Override category default
         # Example: "get_news": "openai",               # Override category default
     },
+    # Run a method's vendor implementations in parallel instead of one by one
+    "concurrent_vendors": False,
+    "vendor_max_workers": 8,
+    "vendor_timeout": None,  # Seconds per vendor call in concurrent mode (None = no limit)
+    "vendor_timeouts": {
+        # Example: "google": 30,  # Per-vendor override of vendor_timeout
+    },
+    # Client-side Alpha Vantage quota (see dataflows/alpha_vantage_common.py); enable
+    # it with the tier of your API key
+    "alpha_vantage_rate_limit": {
+        "enabled": False,
+        "tier": "free",  # Options: free, premium_75, premium_150, premium_300, premium_600, premium_1200
+        "limits": None,  # Explicit [(requests, seconds), ...], overrides tier
+        "max_wait": 60,  # Seconds; a longer wait raises the rate-limit error so routing falls back
+        "state_path": None,  # Shared file (fcntl lock) to pool the quota across processes
+    },
+    # Circuit breaker per vendor implementation (see dataflows/vendor_health.py); an
+    # open one is skipped until a probe call succeeds, and a rate-limit error opens it at once
+    "vendor_circuit_breaker": {
+        "enabled": True,
+        "window": 20,
+        "min_calls": 5,
+        "failure_threshold": 0.5,
+        "open_seconds": 60,
+        "ewma_alpha": 0.2,
+    },
+    # Vendor routing logs: level (e.g. "DEBUG") prints to stderr, path appends NDJSON records
+    "vendor_log_level": None,
+    "vendor_log_path": None,
+    # On-disk cache of vendor results (see dataflows/tool_cache.py)
+    "tool_cache": {
+        "enabled": False,
+        "path": None,  # Defaults to data_cache_dir/tool_cache.sqlite
+        "max_size_mb": 512,
+        "settled_after_days": 2,  # Dates at least this old are history and never expire
+        # Seconds before a result expires, unless all of the call's dates are settled
+        "ttl": {
+            "core_stock_apis": 6 * 3600,
+            "technical_indicators": 6 * 3600,
+            "fundamental_data": 24 * 3600,
+            "news_data": 3600,
+        },
+    },
 }
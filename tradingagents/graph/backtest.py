@@ -0,0 +1,239 @@
+# TradingAgents/graph/backtest.py
+
+import json
+import logging
+import os
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from tradingagents.dataflows.config import get_config
+from tradingagents.dataflows.ohlcv_cache import refresh_series
+from tradingagents.dataflows.price_store import load_price_table
+
+from .trading_graph import TradingAgentsGraph
+
+logger = logging.getLogger(__name__)
+
+# Position taken for each extracted decision
+DECISION_POSITIONS = {"BUY": 1, "SELL": -1, "HOLD": 0}
+
+
+def _reflection_state(final_state: Dict[str, Any]) -> Dict[str, Any]:
+    """The parts of a final state that Reflector reads, small enough to checkpoint."""
+    return {
+        "market_report": final_state["market_report"],
+        "sentiment_report": final_state["sentiment_report"],
+        "news_report": final_state["news_report"],
+        "fundamentals_report": final_state["fundamentals_report"],
+        "investment_debate_state": {
+            "turns": [
+                turn
+                for turn in final_state["investment_debate_state"]["turns"]
+                if turn["speaker"] in ("Bull", "Bear")
+            ],
+            "judge_decision": final_state["investment_debate_state"]["judge_decision"],
+        },
+        "trader_investment_plan": final_state["trader_investment_plan"],
+        "risk_debate_state": {
+            "judge_decision": final_state["risk_debate_state"]["judge_decision"],
+        },
+    }
+
+
+class Backtester:
+    """Walks a trading calendar for a universe of tickers, driving propagate
+    and feeding realized returns back through reflect_and_remember.
+
+    Progress is appended to a JSONL checkpoint after every (ticker, date), so
+    an interrupted run resumes where it stopped and never recomputes a pair.
+    A decision is reflected on only once the walk has reached its exit date,
+    which keeps future returns out of the memories used in between. Set
+    memory_persist_dir in the config so those memories survive a restart too.
+    """
+
+    def __init__(
+        self,
+        graph: TradingAgentsGraph,
+        tickers: List[str],
+        start_date: str,
+        end_date: str,
+        holding_days: int = 1,
+        step: int = 1,
+        max_workers: int = 1,
+        reflect: bool = True,
+        checkpoint_path: Optional[str] = None,
+    ):
+        """Initialize the backtest.
+
+        Args:
+            graph: Graph used for every propagate call
+            tickers: Universe to trade
+            start_date: First trade date, yyyy-mm-dd
+            end_date: Last trade date, yyyy-mm-dd
+            holding_days: Trading days between a decision and its exit
+            step: Trade every step-th day of the calendar
+            max_workers: Tickers propagated concurrently on each date
+            reflect: Whether to call reflect_and_remember with realized returns
+            checkpoint_path: JSONL progress file; defaults to one under results_dir
+        """
+        self.graph = graph
+        self.tickers = list(tickers)
+        self.start_date = start_date
+        self.end_date = end_date
+        self.holding_days = holding_days
+        self.step = step
+        self.max_workers = max_workers
+        self.reflect = reflect
+        self.checkpoint_path = checkpoint_path or os.path.join(
+            graph.config.get("results_dir", "./results"),
+            "backtests",
+            f"backtest_{start_date}_{end_date}.jsonl",
+        )
+
+        self._tables = {}
+        self.records = {}  # (ticker, trade_date) -> decision record
+        self._reflected = set()
+        self._pending = {}  # (ticker, trade_date) -> reflection state
+
+    def _price_table(self, ticker: str):
+        """Price table from the local dataset, or from the OHLCV cache when absent."""
+        table = self._tables.get(ticker)
+        if table is None:
+            local_path = os.path.join(
+                get_config()["data_dir"],
+                f"market_data/price_data/{ticker}-YFin-data-2015-01-01-2025-03-25.csv",
+            )
+            csv_path = local_path if os.path.exists(local_path) else refresh_series(ticker)
+            table = load_price_table(csv_path)
+            self._tables[ticker] = table
+        return table
+
+    def _close(self, table) -> np.ndarray:
+        return table.arrays["Adj Close" if "Adj Close" in table.arrays else "Close"]
+
+    def trading_calendar(self) -> List[str]:
+        """Dates in [start_date, end_date] on which any ticker in the universe traded."""
+        dates = set()
+        for ticker in self.tickers:
+            table = self._price_table(ticker)
+            lo, hi = table.bounds(self.start_date, self.end_date)
+            dates.update(str(d) for d in table.date_keys[lo:hi])
+        return sorted(dates)[:: self.step]
+
+    def realized_return(self, ticker: str, trade_date: str):
+        """Close-to-close return over holding_days, with its exit date, or (None, None)."""
+        table = self._price_table(ticker)
+        lo, hi = table.bounds(trade_date, trade_date)
+        exit_pos = lo + self.holding_days
+        if hi == lo or exit_pos >= len(table):
+            return None, None
+        close = self._close(table)
+        return (
+            float(close[exit_pos] / close[lo] - 1),
+            str(table.date_keys[exit_pos]),
+        )
+
+    def _append(self, entry: Dict[str, Any]) -> None:
+        with open(self.checkpoint_path, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _load_checkpoint(self) -> None:
+        if not os.path.exists(self.checkpoint_path):
+            return
+        with open(self.checkpoint_path, "r") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A crash mid-write leaves at most one torn last line
+                    continue
+                key = (entry["ticker"], entry["trade_date"])
+                if entry["event"] == "decision":
+                    self.records[key] = entry["record"]
+                    if entry.get("reflection_state") is not None:
+                        self._pending[key] = entry["reflection_state"]
+                elif entry["event"] == "reflected":
+                    self._reflected.add(key)
+        for key in self._reflected:
+            self._pending.pop(key, None)
+
+    def _reflect_due(self, current_date: Optional[str]) -> None:
+        """Reflect on pending decisions whose exit date is on or before current_date."""
+        for key in sorted(self._pending, key=lambda k: self.records[k]["exit_date"]):
+            record = self.records[key]
+            if current_date is not None and record["exit_date"] > current_date:
+                continue
+            self.graph.reflect_and_remember(
+                record["realized_return"], final_state=self._pending.pop(key)
+            )
+            self._reflected.add(key)
+            self._append({"event": "reflected", "ticker": key[0], "trade_date": key[1]})
+
+    def run(self) -> List[Dict[str, Any]]:
+        """Run (or resume) the backtest and return one record per (ticker, date)."""
+        os.makedirs(os.path.dirname(os.path.abspath(self.checkpoint_path)), exist_ok=True)
+        self._load_checkpoint()
+
+        for trade_date in self.trading_calendar():
+            if self.reflect:
+                self._reflect_due(trade_date)
+
+            jobs = []
+            for ticker in self.tickers:
+                if (ticker, trade_date) in self.records:
+                    continue
+                table = self._price_table(ticker)
+                lo, hi = table.bounds(trade_date, trade_date)
+                if hi > lo:
+                    jobs.append((ticker, trade_date))
+            if not jobs:
+                continue
+
+            for result in self.graph.propagate_batch(jobs, max_workers=self.max_workers):
+                ticker = result["ticker"]
+                if result["error"] is not None:
+                    # Left out of the checkpoint so a resumed run retries it
+                    logger.warning(
+                        "Backtest: %s on %s failed: %s", ticker, trade_date, result["error"]
+                    )
+                    continue
+
+                decision = result["decision"].strip().upper()
+                realized, exit_date = self.realized_return(ticker, trade_date)
+                position = DECISION_POSITIONS.get(decision, 0)
+                record = {
+                    "ticker": ticker,
+                    "trade_date": trade_date,
+                    "decision": decision,
+                    "exit_date": exit_date,
+                    "realized_return": realized,
+                    "position_return": None if realized is None else position * realized,
+                }
+                reflection_state = (
+                    _reflection_state(result["final_state"])
+                    if self.reflect and realized is not None
+                    else None
+                )
+
+                key = (ticker, trade_date)
+                self.records[key] = record
+                if reflection_state is not None:
+                    self._pending[key] = reflection_state
+                self._append(
+                    {
+                        "event": "decision",
+                        "ticker": ticker,
+                        "trade_date": trade_date,
+                        "record": record,
+                        "reflection_state": reflection_state,
+                    }
+                )
+
+        # Exits after the last trade date are still known from the price data
+        if self.reflect:
+            self._reflect_due(None)
+
+        return [self.records[key] for key in sorted(self.records, key=lambda k: (k[1], k[0]))]
@@ -24,14 +24,14 @@ class Propagator:
             "company_of_interest": company_name,
             "trade_date": str(trade_date),
             "investment_debate_state": InvestDebateState(
-                {"history": "", "current_response": "", "count": 0}
+                {"current_response": "", "turns": [], "count": 0}
             ),
             "risk_debate_state": RiskDebateState(
                 {
-                    "history": "",
                     "current_risky_response": "",
                     "current_safe_response": "",
                     "current_neutral_response": "",
+                    "turns": [],
                     "count": 0,
                 }
             ),
@@ -41,9 +41,18 @@ class Propagator:
             "news_report": "",
         }
 
-    def get_graph_args(self) -> Dict[str, Any]:
-        """Get arguments for the graph invocation."""
+    def get_graph_args(self, thread_id: str = None, callbacks=None) -> Dict[str, Any]:
+        """Get arguments for the graph invocation.
+
+        thread_id selects the checkpoint thread when the graph has a checkpointer;
+        callbacks are LangChain callback handlers attached to every LLM call.
+        """
+        config = {"recursion_limit": self.max_recur_limit}
+        if thread_id is not None:
+            config["configurable"] = {"thread_id": thread_id}
+        if callbacks:
+            config["callbacks"] = callbacks
         return {
             "stream_mode": "values",
-            "config": {"recursion_limit": self.max_recur_limit},
+            "config": config,
         }
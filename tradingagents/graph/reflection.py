@@ -3,6 +3,9 @@
 from typing import Dict, Any
 from langchain_openai import ChatOpenAI
 
+from tradingagents.agents.utils.debate_utils import debate_transcript
+from tradingagents.agents.utils.memory import build_situation
+
 
 class Reflector:
     """Handles reflection on decisions and updating memory."""
@@ -48,12 +51,7 @@ Adhere strictly to these instructions, and ensure your output is detailed, accur
 
     def _extract_current_situation(self, current_state: Dict[str, Any]) -> str:
         """Extract the current market situation from the state."""
-        curr_market_report = current_state["market_report"]
-        curr_sentiment_report = current_state["sentiment_report"]
-        curr_news_report = current_state["news_report"]
-        curr_fundamentals_report = current_state["fundamentals_report"]
-
-        return f"{curr_market_report}\n\n{curr_sentiment_report}\n\n{curr_news_report}\n\n{curr_fundamentals_report}"
+        return build_situation(current_state)
 
     def _reflect_on_component(
         self, component_type: str, report: str, situation: str, returns_losses
@@ -73,7 +71,9 @@ Adhere strictly to these instructions, and ensure your output is detailed, accur
     def reflect_bull_researcher(self, current_state, returns_losses, bull_memory):
         """Reflect on bull researcher's analysis and update memory."""
         situation = self._extract_current_situation(current_state)
-        bull_debate_history = current_state["investment_debate_state"]["bull_history"]
+        bull_debate_history = debate_transcript(
+            current_state["investment_debate_state"], "Bull"
+        )
 
         result = self._reflect_on_component(
             "BULL", bull_debate_history, situation, returns_losses
@@ -83,7 +83,9 @@ Adhere strictly to these instructions, and ensure your output is detailed, accur
     def reflect_bear_researcher(self, current_state, returns_losses, bear_memory):
         """Reflect on bear researcher's analysis and update memory."""
         situation = self._extract_current_situation(current_state)
-        bear_debate_history = current_state["investment_debate_state"]["bear_history"]
+        bear_debate_history = debate_transcript(
+            current_state["investment_debate_state"], "Bear"
+        )
 
         result = self._reflect_on_component(
             "BEAR", bear_debate_history, situation, returns_losses
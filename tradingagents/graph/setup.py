@@ -1,6 +1,8 @@
 # TradingAgents/graph/setup.py
 
 from typing import Dict, Any
+from langchain_core.messages import HumanMessage
+from langchain_core.runnables import RunnableConfig
 from langchain_openai import ChatOpenAI
 from langgraph.graph import END, StateGraph, START
 from langgraph.prebuilt import ToolNode
@@ -11,6 +13,32 @@ from tradingagents.agents.utils.agent_states import AgentState
 from .conditional_logic import ConditionalLogic
 
 
+# State key each analyst writes its report to
+ANALYST_REPORT_KEYS = {
+    "market": "market_report",
+    "social": "sentiment_report",
+    "news": "news_report",
+    "fundamentals": "fundamentals_report",
+}
+
+
+# Node factories per role: (sync, async)
+AGENT_FACTORIES = {
+    "market": (create_market_analyst, create_market_analyst_async),
+    "social": (create_social_media_analyst, create_social_media_analyst_async),
+    "news": (create_news_analyst, create_news_analyst_async),
+    "fundamentals": (create_fundamentals_analyst, create_fundamentals_analyst_async),
+    "bull": (create_bull_researcher, create_bull_researcher_async),
+    "bear": (create_bear_researcher, create_bear_researcher_async),
+    "research_manager": (create_research_manager, create_research_manager_async),
+    "trader": (create_trader, create_trader_async),
+    "risky": (create_risky_debator, create_risky_debator_async),
+    "neutral": (create_neutral_debator, create_neutral_debator_async),
+    "safe": (create_safe_debator, create_safe_debator_async),
+    "risk_manager": (create_risk_manager, create_risk_manager_async),
+}
+
+
 class GraphSetup:
     """Handles the setup and configuration of the agent graph."""
 
@@ -37,8 +65,59 @@ class GraphSetup:
         self.risk_manager_memory = risk_manager_memory
         self.conditional_logic = conditional_logic
 
+    def _create_isolated_analyst(
+        self, analyst_type, analyst_node, tool_node, is_first, use_async=False
+    ):
+        """Wrap an analyst and its tool loop in a subgraph with its own messages.
+
+        The subgraph starts from the same messages the analyst would see in the
+        sequential chain and only the analyst's report is written back, so
+        several analysts can run side by side without sharing a channel.
+        """
+        analyst_name = f"{analyst_type.capitalize()} Analyst"
+        tools_name = f"tools_{analyst_type}"
+        report_key = ANALYST_REPORT_KEYS[analyst_type]
+
+        subgraph = StateGraph(AgentState)
+        subgraph.add_node(analyst_name, analyst_node)
+        subgraph.add_node(tools_name, tool_node)
+        subgraph.add_edge(START, analyst_name)
+        subgraph.add_conditional_edges(
+            analyst_name,
+            getattr(self.conditional_logic, f"should_continue_{analyst_type}"),
+            {tools_name: tools_name, f"Msg Clear {analyst_type.capitalize()}": END},
+        )
+        subgraph.add_edge(tools_name, analyst_name)
+        subgraph = subgraph.compile()
+
+        def isolated_input(state):
+            # The first analyst in the chain sees the initial messages, the
+            # rest see the placeholder left behind by Msg Clear
+            messages = (
+                list(state["messages"]) if is_first else [HumanMessage(content="Continue")]
+            )
+            return {**state, "messages": messages}
+
+        if use_async:
+
+            async def run_analyst_async(state, config: RunnableConfig):
+                result = await subgraph.ainvoke(isolated_input(state), config)
+                return {report_key: result[report_key]}
+
+            return run_analyst_async
+
+        def run_analyst(state, config: RunnableConfig):
+            result = subgraph.invoke(isolated_input(state), config)
+            return {report_key: result[report_key]}
+
+        return run_analyst
+
     def setup_graph(
-        self, selected_analysts=["market", "social", "news", "fundamentals"]
+        self,
+        selected_analysts=["market", "social", "news", "fundamentals"],
+        parallel_analysts=False,
+        use_async=False,
+        checkpointer=None,
     ):
         """Set up and compile the agent workflow graph.
 
@@ -48,73 +127,100 @@ class GraphSetup:
                 - "social": Social media analyst
                 - "news": News analyst
                 - "fundamentals": Fundamentals analyst
+            parallel_analysts (bool): Run the selected analysts concurrently, each
+                on an isolated message channel, and join before Bull Researcher
+            use_async (bool): Build nodes that await the LLMs (ainvoke), for
+                running the graph with ainvoke/astream
+            checkpointer: Optional LangGraph checkpointer that saves the state
+                after every node, keyed by the thread_id of each run
         """
         if len(selected_analysts) == 0:
             raise ValueError("Trading Agents Graph Setup Error: no analysts selected!")
 
+        factories = {
+            role: pair[1] if use_async else pair[0]
+            for role, pair in AGENT_FACTORIES.items()
+        }
+
         # Create analyst nodes
         analyst_nodes = {}
         delete_nodes = {}
         tool_nodes = {}
 
         if "market" in selected_analysts:
-            analyst_nodes["market"] = create_market_analyst(
+            analyst_nodes["market"] = factories["market"](
                 self.quick_thinking_llm
             )
             delete_nodes["market"] = create_msg_delete()
             tool_nodes["market"] = self.tool_nodes["market"]
 
         if "social" in selected_analysts:
-            analyst_nodes["social"] = create_social_media_analyst(
+            analyst_nodes["social"] = factories["social"](
                 self.quick_thinking_llm
             )
             delete_nodes["social"] = create_msg_delete()
             tool_nodes["social"] = self.tool_nodes["social"]
 
         if "news" in selected_analysts:
-            analyst_nodes["news"] = create_news_analyst(
+            analyst_nodes["news"] = factories["news"](
                 self.quick_thinking_llm
             )
             delete_nodes["news"] = create_msg_delete()
             tool_nodes["news"] = self.tool_nodes["news"]
 
         if "fundamentals" in selected_analysts:
-            analyst_nodes["fundamentals"] = create_fundamentals_analyst(
+            analyst_nodes["fundamentals"] = factories["fundamentals"](
                 self.quick_thinking_llm
             )
             delete_nodes["fundamentals"] = create_msg_delete()
             tool_nodes["fundamentals"] = self.tool_nodes["fundamentals"]
 
         # Create researcher and manager nodes
-        bull_researcher_node = create_bull_researcher(
+        bull_researcher_node = factories["bull"](
             self.quick_thinking_llm, self.bull_memory
         )
-        bear_researcher_node = create_bear_researcher(
+        bear_researcher_node = factories["bear"](
             self.quick_thinking_llm, self.bear_memory
         )
-        research_manager_node = create_research_manager(
+        research_manager_node = factories["research_manager"](
             self.deep_thinking_llm, self.invest_judge_memory
         )
-        trader_node = create_trader(self.quick_thinking_llm, self.trader_memory)
+        trader_node = factories["trader"](self.quick_thinking_llm, self.trader_memory)
 
         # Create risk analysis nodes
-        risky_analyst = create_risky_debator(self.quick_thinking_llm)
-        neutral_analyst = create_neutral_debator(self.quick_thinking_llm)
-        safe_analyst = create_safe_debator(self.quick_thinking_llm)
-        risk_manager_node = create_risk_manager(
+        risky_analyst = factories["risky"](self.quick_thinking_llm)
+        neutral_analyst = factories["neutral"](self.quick_thinking_llm)
+        safe_analyst = factories["safe"](self.quick_thinking_llm)
+        risk_manager_node = factories["risk_manager"](
             self.deep_thinking_llm, self.risk_manager_memory
         )
 
         # Create workflow
         workflow = StateGraph(AgentState)
 
-        # Add analyst nodes to the graph
-        for analyst_type, node in analyst_nodes.items():
-            workflow.add_node(f"{analyst_type.capitalize()} Analyst", node)
-            workflow.add_node(
-                f"Msg Clear {analyst_type.capitalize()}", delete_nodes[analyst_type]
-            )
-            workflow.add_node(f"tools_{analyst_type}", tool_nodes[analyst_type])
+        if parallel_analysts:
+            # Each analyst runs its own tool loop; the join clears messages
+            # exactly like the last Msg Clear node of the sequential chain
+            for i, analyst_type in enumerate(selected_analysts):
+                workflow.add_node(
+                    f"{analyst_type.capitalize()} Analyst",
+                    self._create_isolated_analyst(
+                        analyst_type,
+                        analyst_nodes[analyst_type],
+                        tool_nodes[analyst_type],
+                        is_first=i == 0,
+                        use_async=use_async,
+                    ),
+                )
+            workflow.add_node("Msg Clear Analysts", create_msg_delete())
+        else:
+            # Add analyst nodes to the graph
+            for analyst_type, node in analyst_nodes.items():
+                workflow.add_node(f"{analyst_type.capitalize()} Analyst", node)
+                workflow.add_node(
+                    f"Msg Clear {analyst_type.capitalize()}", delete_nodes[analyst_type]
+                )
+                workflow.add_node(f"tools_{analyst_type}", tool_nodes[analyst_type])
 
         # Add other nodes
         workflow.add_node("Bull Researcher", bull_researcher_node)
@@ -127,30 +233,41 @@ class GraphSetup:
         workflow.add_node("Risk Judge", risk_manager_node)
 
         # Define edges
-        # Start with the first analyst
-        first_analyst = selected_analysts[0]
-        workflow.add_edge(START, f"{first_analyst.capitalize()} Analyst")
-
-        # Connect analysts in sequence
-        for i, analyst_type in enumerate(selected_analysts):
-            current_analyst = f"{analyst_type.capitalize()} Analyst"
-            current_tools = f"tools_{analyst_type}"
-            current_clear = f"Msg Clear {analyst_type.capitalize()}"
-
-            # Add conditional edges for current analyst
-            workflow.add_conditional_edges(
-                current_analyst,
-                getattr(self.conditional_logic, f"should_continue_{analyst_type}"),
-                [current_tools, current_clear],
-            )
-            workflow.add_edge(current_tools, current_analyst)
+        if parallel_analysts:
+            # Fan out from START and wait for every report before the debate
+            analyst_names = [
+                f"{analyst_type.capitalize()} Analyst"
+                for analyst_type in selected_analysts
+            ]
+            for analyst_name in analyst_names:
+                workflow.add_edge(START, analyst_name)
+            workflow.add_edge(analyst_names, "Msg Clear Analysts")
+            workflow.add_edge("Msg Clear Analysts", "Bull Researcher")
+        else:
+            # Start with the first analyst
+            first_analyst = selected_analysts[0]
+            workflow.add_edge(START, f"{first_analyst.capitalize()} Analyst")
+
+            # Connect analysts in sequence
+            for i, analyst_type in enumerate(selected_analysts):
+                current_analyst = f"{analyst_type.capitalize()} Analyst"
+                current_tools = f"tools_{analyst_type}"
+                current_clear = f"Msg Clear {analyst_type.capitalize()}"
+
+                # Add conditional edges for current analyst
+                workflow.add_conditional_edges(
+                    current_analyst,
+                    getattr(self.conditional_logic, f"should_continue_{analyst_type}"),
+                    [current_tools, current_clear],
+                )
+                workflow.add_edge(current_tools, current_analyst)
 
-            # Connect to next analyst or to Bull Researcher if this is the last analyst
-            if i < len(selected_analysts) - 1:
-                next_analyst = f"{selected_analysts[i+1].capitalize()} Analyst"
-                workflow.add_edge(current_clear, next_analyst)
-            else:
-                workflow.add_edge(current_clear, "Bull Researcher")
+                # Connect to next analyst or to Bull Researcher if this is the last analyst
+                if i < len(selected_analysts) - 1:
+                    next_analyst = f"{selected_analysts[i+1].capitalize()} Analyst"
+                    workflow.add_edge(current_clear, next_analyst)
+                else:
+                    workflow.add_edge(current_clear, "Bull Researcher")
 
         # Add remaining edges
         workflow.add_conditional_edges(
@@ -199,4 +316,4 @@ class GraphSetup:
         workflow.add_edge("Risk Judge", END)
 
         # Compile and return
-        return workflow.compile()
+        return workflow.compile(checkpointer=checkpointer)
@@ -0,0 +1,262 @@
+# TradingAgents/graph/telemetry.py
+
+import csv
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from langchain_core.callbacks import BaseCallbackHandler
+
+# Per-node counters, in CSV column order
+NODE_FIELDS = (
+    "runs",
+    "wall_time",
+    "llm_calls",
+    "llm_time",
+    "prompt_tokens",
+    "completion_tokens",
+    "tool_calls",
+    "tool_errors",
+    "tool_time",
+    "tool_bytes",
+)
+
+
+def _top_level_node(metadata: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Outermost graph node an event belongs to.
+
+    Events inside an isolated analyst subgraph are charged to the analyst
+    node of the main graph, so nested node runs are not counted twice.
+    """
+    metadata = metadata or {}
+    namespace = metadata.get("langgraph_checkpoint_ns")
+    if namespace:
+        return namespace.split("|")[0].split(":")[0]
+    return metadata.get("langgraph_node")
+
+
+def _is_top_level(metadata: Optional[Dict[str, Any]]) -> bool:
+    return "|" not in (metadata or {}).get("langgraph_checkpoint_ns", "")
+
+
+def _token_usage(response) -> tuple:
+    """(prompt, completion) tokens reported by the provider for one LLM call."""
+    prompt_tokens = completion_tokens = 0
+    for generations in response.generations:
+        for generation in generations:
+            usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if usage:
+                prompt_tokens += usage.get("input_tokens", 0)
+                completion_tokens += usage.get("output_tokens", 0)
+    if prompt_tokens or completion_tokens:
+        return prompt_tokens, completion_tokens
+
+    usage = (response.llm_output or {}).get("token_usage") or {}
+    return usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0)
+
+
+def _output_bytes(output) -> int:
+    content = getattr(output, "content", output)
+    if not isinstance(content, str):
+        content = json.dumps(content, default=str)
+    return len(content.encode())
+
+
+class NodeTelemetry(BaseCallbackHandler):
+    """Per-node wall time, LLM tokens and tool traffic for one graph run.
+
+    Attach it through the graph config callbacks; it then sees every node
+    set up by GraphSetup and every tool run by a ToolNode. Events are keyed
+    by the langgraph_node metadata LangGraph puts on each callback.
+    """
+
+    def __init__(self, ticker: str = None, trade_date: str = None):
+        self.ticker = ticker
+        self.trade_date = str(trade_date) if trade_date is not None else None
+        self._nodes = {}
+        self._open = {}  # run_id -> (kind, node, start time)
+        self._started = None
+        self._finished = None
+        self._lock = threading.Lock()
+
+    def _node(self, node: str) -> Dict[str, float]:
+        return self._nodes.setdefault(node, {field: 0 for field in NODE_FIELDS})
+
+    def _start(self, run_id, kind: str, node: Optional[str]) -> None:
+        if node is None:
+            return
+        now = time.perf_counter()
+        with self._lock:
+            if self._started is None:
+                self._started = now
+            self._open[run_id] = (kind, node, now)
+
+    def _end(self, run_id, kind: str):
+        """Pop an open run of this kind; returns (node, elapsed) or None."""
+        now = time.perf_counter()
+        with self._lock:
+            entry = self._open.get(run_id)
+            if entry is None or entry[0] != kind:
+                return None
+            del self._open[run_id]
+            self._finished = now
+            return entry[1], now - entry[2]
+
+    def on_chain_start(self, serialized, inputs, *, run_id, metadata=None, **kwargs):
+        # Only the node's own run, not the chains nested inside it
+        node = (metadata or {}).get("langgraph_node")
+        if node is not None and kwargs.get("name") == node and _is_top_level(metadata):
+            self._start(run_id, "node", node)
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs):
+        ended = self._end(run_id, "node")
+        if ended is not None:
+            with self._lock:
+                stats = self._node(ended[0])
+                stats["runs"] += 1
+                stats["wall_time"] += ended[1]
+
+    def on_chain_error(self, error, *, run_id, **kwargs):
+        self.on_chain_end(None, run_id=run_id)
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, metadata=None, **kwargs):
+        self._start(run_id, "llm", _top_level_node(metadata))
+
+    def on_llm_start(self, serialized, prompts, *, run_id, metadata=None, **kwargs):
+        self._start(run_id, "llm", _top_level_node(metadata))
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        ended = self._end(run_id, "llm")
+        if ended is None:
+            return
+        prompt_tokens, completion_tokens = _token_usage(response)
+        with self._lock:
+            stats = self._node(ended[0])
+            stats["llm_calls"] += 1
+            stats["llm_time"] += ended[1]
+            stats["prompt_tokens"] += prompt_tokens
+            stats["completion_tokens"] += completion_tokens
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        ended = self._end(run_id, "llm")
+        if ended is not None:
+            with self._lock:
+                stats = self._node(ended[0])
+                stats["llm_calls"] += 1
+                stats["llm_time"] += ended[1]
+
+    def on_tool_start(self, serialized, input_str, *, run_id, metadata=None, **kwargs):
+        self._start(run_id, "tool", _top_level_node(metadata))
+
+    def on_tool_end(self, output, *, run_id, **kwargs):
+        ended = self._end(run_id, "tool")
+        if ended is not None:
+            with self._lock:
+                stats = self._node(ended[0])
+                stats["tool_calls"] += 1
+                stats["tool_time"] += ended[1]
+                stats["tool_bytes"] += _output_bytes(output)
+
+    def on_tool_error(self, error, *, run_id, **kwargs):
+        ended = self._end(run_id, "tool")
+        if ended is not None:
+            with self._lock:
+                stats = self._node(ended[0])
+                stats["tool_calls"] += 1
+                stats["tool_errors"] += 1
+                stats["tool_time"] += ended[1]
+
+    def summary(self) -> Dict[str, Any]:
+        """The run's totals and per-node counters, JSON-serializable."""
+        with self._lock:
+            nodes = {node: dict(stats) for node, stats in self._nodes.items()}
+            total_time = (
+                self._finished - self._started
+                if self._started is not None and self._finished is not None
+                else 0.0
+            )
+        return {
+            "ticker": self.ticker,
+            "trade_date": self.trade_date,
+            "total_time": total_time,
+            "prompt_tokens": sum(s["prompt_tokens"] for s in nodes.values()),
+            "completion_tokens": sum(s["completion_tokens"] for s in nodes.values()),
+            "tool_calls": sum(s["tool_calls"] for s in nodes.values()),
+            "nodes": nodes,
+        }
+
+
+def telemetry_rows(summaries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """One flat row per (run, node), for CSV export."""
+    rows = []
+    for summary in summaries:
+        for node, stats in summary["nodes"].items():
+            rows.append(
+                {
+                    "ticker": summary["ticker"],
+                    "trade_date": summary["trade_date"],
+                    "node": node,
+                    **{field: stats[field] for field in NODE_FIELDS},
+                }
+            )
+    return rows
+
+
+def export_telemetry_json(summaries: List[Dict[str, Any]], path: str) -> None:
+    """Write run summaries (one dict or a list) to a JSON file."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(summaries, f, indent=4)
+
+
+def export_telemetry_csv(summaries: List[Dict[str, Any]], path: str) -> None:
+    """Write one row per (run, node) to a CSV file."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(
+            f, fieldnames=["ticker", "trade_date", "node", *NODE_FIELDS]
+        )
+        writer.writeheader()
+        writer.writerows(telemetry_rows(summaries))
+
+
+def aggregate_telemetry(summaries: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Latency percentiles and totals per node across many runs.
+
+    Each node's per-run wall time (summed over its rounds) gives p50/p95/max;
+    bottleneck names the node with the highest p95.
+    """
+    nodes = {}
+    for summary in summaries:
+        for node, stats in summary["nodes"].items():
+            nodes.setdefault(node, []).append(stats)
+
+    aggregated = {}
+    for node, runs in nodes.items():
+        wall_times = np.array([stats["wall_time"] for stats in runs])
+        aggregated[node] = {
+            "runs": len(runs),
+            "wall_time_mean": float(wall_times.mean()),
+            "wall_time_p50": float(np.percentile(wall_times, 50)),
+            "wall_time_p95": float(np.percentile(wall_times, 95)),
+            "wall_time_max": float(wall_times.max()),
+            **{
+                field: sum(stats[field] for stats in runs)
+                for field in NODE_FIELDS
+                if field not in ("runs", "wall_time")
+            },
+        }
+
+    total_times = np.array([summary["total_time"] for summary in summaries] or [0.0])
+    return {
+        "runs": len(summaries),
+        "total_time_p50": float(np.percentile(total_times, 50)),
+        "total_time_p95": float(np.percentile(total_times, 95)),
+        "bottleneck": max(
+            aggregated, key=lambda node: aggregated[node]["wall_time_p95"], default=None
+        ),
+        "nodes": aggregated,
+    }
@@ -1,10 +1,15 @@
 # TradingAgents/graph/trading_graph.py
 
+import asyncio
+import copy
 import os
+import sqlite3
 from pathlib import Path
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import date
-from typing import Dict, Any, Tuple, List, Optional
+from typing import Dict, Any, Tuple, List, Optional, Iterator, AsyncIterator
 
 from langchain_openai import ChatOpenAI
 from langchain_anthropic import ChatAnthropic
@@ -12,15 +17,25 @@ from langchain_google_genai import ChatGoogleGenerativeAI
 
 from langgraph.prebuilt import ToolNode
 
+try:
+    from langgraph.checkpoint.sqlite import SqliteSaver
+except ImportError:  # optional: pip install langgraph-checkpoint-sqlite
+    SqliteSaver = None
+
 from tradingagents.agents import *
 from tradingagents.default_config import DEFAULT_CONFIG
 from tradingagents.agents.utils.memory import FinancialSituationMemory
+from tradingagents.agents.utils.debate_utils import debate_transcript
+from tradingagents.agents.utils.prompt_utils import PromptCacheTracker
 from tradingagents.agents.utils.agent_states import (
     AgentState,
     InvestDebateState,
     RiskDebateState,
 )
 from tradingagents.dataflows.config import set_config
+from tradingagents.dataflows.ohlcv_cache import prefetch_ohlcv
+from tradingagents.dataflows.indicator_engine import get_indicator_set
+from tradingagents.dataflows.vendor_log import configure_vendor_logging
 
 # Import the new abstract tool methods from agent_utils
 from tradingagents.agents.utils.agent_utils import (
@@ -41,6 +56,7 @@ from .setup import GraphSetup
 from .propagation import Propagator
 from .reflection import Reflector
 from .signal_processing import SignalProcessor
+from .telemetry import NodeTelemetry, export_telemetry_json
 
 
 class TradingAgentsGraph:
@@ -64,6 +80,9 @@ class TradingAgentsGraph:
 
         # Update the interface's config
         set_config(self.config)
+        configure_vendor_logging(
+            self.config.get("vendor_log_level"), self.config.get("vendor_log_path")
+        )
 
         # Create necessary directories
         os.makedirs(
@@ -95,7 +114,10 @@ class TradingAgentsGraph:
         self.tool_nodes = self._create_tool_nodes()
 
         # Initialize components
-        self.conditional_logic = ConditionalLogic()
+        self.conditional_logic = ConditionalLogic(
+            max_debate_rounds=self.config["max_debate_rounds"],
+            max_risk_discuss_rounds=self.config["max_risk_discuss_rounds"],
+        )
         self.graph_setup = GraphSetup(
             self.quick_thinking_llm,
             self.deep_thinking_llm,
@@ -108,17 +130,47 @@ class TradingAgentsGraph:
             self.conditional_logic,
         )
 
-        self.propagator = Propagator()
+        self.propagator = Propagator(self.config["max_recur_limit"])
         self.reflector = Reflector(self.quick_thinking_llm)
         self.signal_processor = SignalProcessor(self.quick_thinking_llm)
 
         # State tracking
         self.curr_state = None
         self.ticker = None
+        self.prompt_cache_stats = None  # prompt prefix reuse of the last propagate
+        self.telemetry_stats = None  # per-node timing and tokens of the last propagate
         self.log_states_dict = {}  # date to full state dict
+        self._ticker_logs = {}  # ticker to {date: full state dict}
+        self._log_lock = threading.Lock()
+
+        # Optional checkpointer so an interrupted run resumes from its last node
+        self.checkpointer = self._create_checkpointer()
 
         # Set up the graph
-        self.graph = self.graph_setup.setup_graph(selected_analysts)
+        self.selected_analysts = selected_analysts
+        self.graph = self.graph_setup.setup_graph(
+            selected_analysts,
+            parallel_analysts=self.config.get("parallel_analysts", False),
+            checkpointer=self.checkpointer,
+        )
+        self._async_graph = None  # built on first apropagate
+
+    def _create_checkpointer(self):
+        """SqliteSaver on config["checkpoint_db"], or None when not configured."""
+        checkpoint_db = self.config.get("checkpoint_db")
+        if not checkpoint_db:
+            return None
+        if SqliteSaver is None:
+            raise ImportError(
+                "checkpoint_db requires langgraph-checkpoint-sqlite "
+                "(pip install langgraph-checkpoint-sqlite)"
+            )
+        os.makedirs(os.path.dirname(os.path.abspath(checkpoint_db)), exist_ok=True)
+        return SqliteSaver(sqlite3.connect(checkpoint_db, check_same_thread=False))
+
+    @staticmethod
+    def _thread_id(company_name, trade_date):
+        return f"{company_name}-{trade_date}"
 
     def _create_tool_nodes(self) -> Dict[str, ToolNode]:
         """Create tool nodes for different data sources using abstract methods."""
@@ -157,16 +209,64 @@ class TradingAgentsGraph:
             ),
         }
 
-    def propagate(self, company_name, trade_date):
-        """Run the trading agents graph for a company on a specific date."""
+    def prefetch_market_data(self, tickers: List[str]) -> List[str]:
+        """Download OHLCV for all tickers in one batch before running propagate.
 
-        self.ticker = company_name
+        Warms the per-symbol price caches and, when indicators come from
+        yfinance, computes each symbol's indicator set up front. Returns the
+        tickers that were fetched.
+        """
+        fetched = prefetch_ohlcv(tickers)
 
+        indicator_vendor = self.config.get("tool_vendors", {}).get(
+            "get_indicators", self.config["data_vendors"]["technical_indicators"]
+        )
+        if "yfinance" in indicator_vendor:
+            for ticker in fetched:
+                get_indicator_set(ticker)
+
+        return fetched
+
+    def _create_run_callbacks(self, company_name, trade_date):
+        """Fresh handlers for one run: prompt prefix reuse and node telemetry."""
+        return [PromptCacheTracker(), NodeTelemetry(company_name, trade_date)]
+
+    def _collect_run_stats(self, callbacks) -> Dict[str, Any]:
+        """Summaries of a run's handlers, also written to telemetry_dir if set."""
+        prompt_cache, telemetry = callbacks
+        stats = {"prompt_cache": prompt_cache.summary(), "telemetry": telemetry.summary()}
+
+        telemetry_dir = self.config.get("telemetry_dir")
+        if telemetry_dir:
+            export_telemetry_json(
+                stats["telemetry"],
+                os.path.join(
+                    telemetry_dir, f"{telemetry.ticker}_{telemetry.trade_date}.json"
+                ),
+            )
+        return stats
+
+    def _run_graph(self, company_name, trade_date, callbacks=None):
+        """Run the graph for one (company, date) pair and return its final state.
+
+        Touches no instance state, so several runs can share this object.
+        With a checkpointer, a run that stopped partway resumes from its last
+        completed node, and a finished run is started over.
+        """
         # Initialize state
         init_agent_state = self.propagator.create_initial_state(
             company_name, trade_date
         )
-        args = self.propagator.get_graph_args()
+        args = self.propagator.get_graph_args(callbacks=callbacks)
+
+        if self.checkpointer is not None:
+            thread_id = self._thread_id(company_name, trade_date)
+            args = self.propagator.get_graph_args(thread_id, callbacks=callbacks)
+            snapshot = self.graph.get_state(args["config"])
+            if snapshot.next:
+                init_agent_state = None
+            elif snapshot.values:
+                self.checkpointer.delete_thread(thread_id)
 
         if self.debug:
             # Debug mode with tracing
@@ -178,23 +278,239 @@ class TradingAgentsGraph:
                     chunk["messages"][-1].pretty_print()
                     trace.append(chunk)
 
-            final_state = trace[-1]
-        else:
-            # Standard mode without tracing
-            final_state = self.graph.invoke(init_agent_state, **args)
+            return trace[-1]
+
+        # Standard mode without tracing
+        return self.graph.invoke(init_agent_state, **args)
+
+    def propagate(self, company_name, trade_date):
+        """Run the trading agents graph for a company on a specific date."""
+
+        self.ticker = company_name
+
+        callbacks = self._create_run_callbacks(company_name, trade_date)
+        final_state = self._run_graph(company_name, trade_date, callbacks=callbacks)
 
         # Store current state for reflection
         self.curr_state = final_state
+        stats = self._collect_run_stats(callbacks)
+        self.prompt_cache_stats = stats["prompt_cache"]
+        self.telemetry_stats = stats["telemetry"]
 
         # Log state
-        self._log_state(trade_date, final_state)
+        self._log_state(trade_date, final_state, company_name)
 
         # Return decision and processed signal
         return final_state, self.process_signal(final_state["final_trade_decision"])
 
-    def _log_state(self, trade_date, final_state):
+    def propagate_batch(
+        self, jobs: List[Tuple[str, str]], max_workers: int = 4
+    ) -> Iterator[Dict[str, Any]]:
+        """Run many (ticker, trade_date) jobs concurrently, yielding results as they finish.
+
+        Each job gets its own graph state; curr_state and ticker are left
+        untouched. Every yielded dict has ticker, trade_date, final_state,
+        decision, prompt_cache, telemetry and error keys. A failed job has
+        error set and None for the others instead of stopping the batch.
+        Pass the telemetry of all results to aggregate_telemetry to find the
+        nodes that dominate latency.
+        """
+
+        def run_job(ticker, trade_date):
+            callbacks = self._create_run_callbacks(ticker, trade_date)
+            final_state = self._run_graph(ticker, trade_date, callbacks=callbacks)
+            self._log_state(trade_date, final_state, ticker)
+            decision = self.process_signal(final_state["final_trade_decision"])
+            return final_state, decision, self._collect_run_stats(callbacks)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(run_job, ticker, trade_date): (ticker, trade_date)
+                for ticker, trade_date in jobs
+            }
+            try:
+                for future in as_completed(futures):
+                    ticker, trade_date = futures[future]
+                    result = {
+                        "ticker": ticker,
+                        "trade_date": str(trade_date),
+                        "final_state": None,
+                        "decision": None,
+                        "prompt_cache": None,
+                        "telemetry": None,
+                        "error": None,
+                    }
+                    try:
+                        result["final_state"], result["decision"], stats = future.result()
+                        result.update(stats)
+                    except Exception as e:
+                        result["error"] = e
+                    yield result
+            finally:
+                # Stop queued jobs if the caller abandons the generator
+                for future in futures:
+                    future.cancel()
+
+    def replay_debate(
+        self,
+        company_name,
+        trade_date,
+        max_debate_rounds=None,
+        max_risk_discuss_rounds=None,
+    ):
+        """Re-run only the debate stages of a checkpointed run.
+
+        Forks the run's thread at the checkpoint taken just before Bull
+        Researcher, so the analyst reports are reused and only the research
+        debate, trader and risk debate run again, optionally with different
+        round limits. Like propagate, it records prompt_cache_stats and
+        telemetry_stats for the replayed stages.
+        """
+        if self.checkpointer is None:
+            raise ValueError("replay_debate requires config['checkpoint_db']")
+
+        callbacks = self._create_run_callbacks(company_name, trade_date)
+        args = self.propagator.get_graph_args(
+            self._thread_id(company_name, trade_date), callbacks=callbacks
+        )
+        fork = next(
+            (
+                snapshot
+                for snapshot in self.graph.get_state_history(args["config"])
+                if snapshot.next == ("Bull Researcher",)
+            ),
+            None,
+        )
+        if fork is None:
+            raise ValueError(
+                f"No checkpointed analyst reports for {company_name} on {trade_date}"
+            )
+
+        graph_setup = copy.copy(self.graph_setup)
+        graph_setup.conditional_logic = ConditionalLogic(
+            max_debate_rounds=max_debate_rounds or self.conditional_logic.max_debate_rounds,
+            max_risk_discuss_rounds=max_risk_discuss_rounds
+            or self.conditional_logic.max_risk_discuss_rounds,
+        )
+        graph = graph_setup.setup_graph(
+            self.selected_analysts,
+            parallel_analysts=self.config.get("parallel_analysts", False),
+            checkpointer=self.checkpointer,
+        )
+
+        final_state = graph.invoke(None, **{**args, "config": {**args["config"], **fork.config}})
+
+        self.ticker = company_name
+        self.curr_state = final_state
+        stats = self._collect_run_stats(callbacks)
+        self.prompt_cache_stats = stats["prompt_cache"]
+        self.telemetry_stats = stats["telemetry"]
+        self._log_state(trade_date, final_state, company_name)
+
+        return final_state, self.process_signal(final_state["final_trade_decision"])
+
+    @property
+    def async_graph(self):
+        """Graph whose nodes await the LLMs, for use with ainvoke/astream.
+
+        Built without the checkpointer, since SqliteSaver is synchronous.
+        """
+        if self._async_graph is None:
+            self._async_graph = self.graph_setup.setup_graph(
+                self.selected_analysts,
+                parallel_analysts=self.config.get("parallel_analysts", False),
+                use_async=True,
+            )
+        return self._async_graph
+
+    async def _arun_graph(self, company_name, trade_date, callbacks=None):
+        """Async version of _run_graph."""
+        init_agent_state = self.propagator.create_initial_state(
+            company_name, trade_date
+        )
+        args = self.propagator.get_graph_args(callbacks=callbacks)
+
+        if self.debug:
+            trace = []
+            async for chunk in self.async_graph.astream(init_agent_state, **args):
+                if len(chunk["messages"]) == 0:
+                    pass
+                else:
+                    chunk["messages"][-1].pretty_print()
+                    trace.append(chunk)
+
+            return trace[-1]
+
+        return await self.async_graph.ainvoke(init_agent_state, **args)
+
+    async def _arun_job(self, company_name, trade_date):
+        callbacks = self._create_run_callbacks(company_name, trade_date)
+        final_state = await self._arun_graph(
+            company_name, trade_date, callbacks=callbacks
+        )
+        await asyncio.to_thread(self._log_state, trade_date, final_state, company_name)
+        decision = await self.aprocess_signal(final_state["final_trade_decision"])
+        stats = await asyncio.to_thread(self._collect_run_stats, callbacks)
+        return final_state, decision, stats
+
+    async def apropagate(self, company_name, trade_date):
+        """Async version of propagate; many calls can share one event loop.
+
+        curr_state and ticker end up describing the run that finished last.
+        """
+        final_state, decision, stats = await self._arun_job(company_name, trade_date)
+        self.prompt_cache_stats = stats["prompt_cache"]
+        self.telemetry_stats = stats["telemetry"]
+
+        self.ticker = company_name
+        self.curr_state = final_state
+
+        return final_state, decision
+
+    async def apropagate_batch(
+        self, jobs: List[Tuple[str, str]], max_concurrency: int = 16
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Async version of propagate_batch, bounded by max_concurrency runs in flight."""
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run_job(ticker, trade_date):
+            result = {
+                "ticker": ticker,
+                "trade_date": str(trade_date),
+                "final_state": None,
+                "decision": None,
+                "prompt_cache": None,
+                "telemetry": None,
+                "error": None,
+            }
+            async with semaphore:
+                try:
+                    result["final_state"], result["decision"], stats = await self._arun_job(
+                        ticker, trade_date
+                    )
+                    result.update(stats)
+                except Exception as e:
+                    result["error"] = e
+            return result
+
+        tasks = [
+            asyncio.ensure_future(run_job(ticker, trade_date))
+            for ticker, trade_date in jobs
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Stop outstanding runs if the caller abandons the iterator
+            for task in tasks:
+                task.cancel()
+
+    def _log_state(self, trade_date, final_state, ticker=None):
         """Log the final state to a JSON file."""
-        self.log_states_dict[str(trade_date)] = {
+        ticker = ticker or self.ticker
+        invest_debate = final_state["investment_debate_state"]
+        risk_debate = final_state["risk_debate_state"]
+        entry = {
             "company_of_interest": final_state["company_of_interest"],
             "trade_date": final_state["trade_date"],
             "market_report": final_state["market_report"],
@@ -202,9 +518,9 @@ class TradingAgentsGraph:
             "news_report": final_state["news_report"],
             "fundamentals_report": final_state["fundamentals_report"],
             "investment_debate_state": {
-                "bull_history": final_state["investment_debate_state"]["bull_history"],
-                "bear_history": final_state["investment_debate_state"]["bear_history"],
-                "history": final_state["investment_debate_state"]["history"],
+                "bull_history": debate_transcript(invest_debate, "Bull"),
+                "bear_history": debate_transcript(invest_debate, "Bear"),
+                "history": debate_transcript(invest_debate),
                 "current_response": final_state["investment_debate_state"][
                     "current_response"
                 ],
@@ -214,44 +530,58 @@ class TradingAgentsGraph:
             },
             "trader_investment_decision": final_state["trader_investment_plan"],
             "risk_debate_state": {
-                "risky_history": final_state["risk_debate_state"]["risky_history"],
-                "safe_history": final_state["risk_debate_state"]["safe_history"],
-                "neutral_history": final_state["risk_debate_state"]["neutral_history"],
-                "history": final_state["risk_debate_state"]["history"],
+                "risky_history": debate_transcript(risk_debate, "Risky"),
+                "safe_history": debate_transcript(risk_debate, "Safe"),
+                "neutral_history": debate_transcript(risk_debate, "Neutral"),
+                "history": debate_transcript(risk_debate),
                 "judge_decision": final_state["risk_debate_state"]["judge_decision"],
             },
             "investment_plan": final_state["investment_plan"],
             "final_trade_decision": final_state["final_trade_decision"],
         }
 
-        # Save to file
-        directory = Path(f"eval_results/{self.ticker}/TradingAgentsStrategy_logs/")
-        directory.mkdir(parents=True, exist_ok=True)
+        with self._log_lock:
+            self.log_states_dict[str(trade_date)] = entry
+            ticker_log = self._ticker_logs.setdefault(ticker, {})
+            ticker_log[str(trade_date)] = entry
 
-        with open(
-            f"eval_results/{self.ticker}/TradingAgentsStrategy_logs/full_states_log_{trade_date}.json",
-            "w",
-        ) as f:
-            json.dump(self.log_states_dict, f, indent=4)
+            # Save to file
+            directory = Path(f"eval_results/{ticker}/TradingAgentsStrategy_logs/")
+            directory.mkdir(parents=True, exist_ok=True)
 
-    def reflect_and_remember(self, returns_losses):
-        """Reflect on decisions and update memory based on returns."""
+            with open(
+                f"eval_results/{ticker}/TradingAgentsStrategy_logs/full_states_log_{trade_date}.json",
+                "w",
+            ) as f:
+                json.dump(ticker_log, f, indent=4)
+
+    def reflect_and_remember(self, returns_losses, final_state=None):
+        """Reflect on decisions and update memory based on returns.
+
+        Reflects on final_state if given (e.g. a propagate_batch result),
+        otherwise on the state of the last propagate call.
+        """
+        state = final_state if final_state is not None else self.curr_state
         self.reflector.reflect_bull_researcher(
-            self.curr_state, returns_losses, self.bull_memory
+            state, returns_losses, self.bull_memory
         )
         self.reflector.reflect_bear_researcher(
-            self.curr_state, returns_losses, self.bear_memory
+            state, returns_losses, self.bear_memory
         )
         self.reflector.reflect_trader(
-            self.curr_state, returns_losses, self.trader_memory
+            state, returns_losses, self.trader_memory
         )
         self.reflector.reflect_invest_judge(
-            self.curr_state, returns_losses, self.invest_judge_memory
+            state, returns_losses, self.invest_judge_memory
         )
         self.reflector.reflect_risk_manager(
-            self.curr_state, returns_losses, self.risk_manager_memory
+            state, returns_losses, self.risk_manager_memory
         )
 
     def process_signal(self, full_signal):
         """Process a signal to extract the core decision."""
         return self.signal_processor.process_signal(full_signal)
+
+    async def aprocess_signal(self, full_signal):
+        """Async version of process_signal."""
+        return await self.signal_processor.aprocess_signal(full_signal)